@@ -2,13 +2,13 @@
 # 📦 Importações de bibliotecas necessárias
 # ---------------------------------------------------
 import os
-import re
-import requests
+import time
+from collections import deque
 import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import pandas as pd
 import streamlit as st
+from .client import get_client
+from .preprocessing import cleanTexts, cleanTextsByLanguage, makeCleaningPool, DEFAULT_TOKENIZER
 
 # ---------------------------------------------------
 # 🧠 Função para configurar o caminho local do NLTK
@@ -21,130 +21,204 @@ def nltkDownload():
 # ---------------------------------------------------
 # 🧹 Função para limpeza e tokenização de texto
 # ---------------------------------------------------
-def cleanText(text, language):
-    # Converte o texto para minúsculas
-    text = text.lower()
-
-    # Remove URLs
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-
-    # Remove pontuação e números
-    text = re.sub(r'[^\w\s]', '', text)
-    text = re.sub(r'\d+', '', text)
-
-    # Mapeia siglas de idioma para formatos reconhecidos pelo NLTK
-    language_map = {"pt": "portuguese", "en": "english"}
-    language = language_map.get(language, language)
-
-    # Tenta tokenizar o texto com o idioma especificado
-    try:
-        tokens = nltk.word_tokenize(text, language=language)
-    except LookupError:
-        print(f"Erro: Não foi possível encontrar os recursos de tokenização para '{language}'.")
-        tokens = text.split()  # Fallback: separação simples por espaço
-
-    # Remove stopwords (palavras comuns irrelevantes)
-    stop_words = set(nltk.corpus.stopwords.words(language if language in nltk.corpus.stopwords.fileids() else 'english'))
-    tokens_sem_stopwords = [word for word in tokens if word not in stop_words]
-    return tokens_sem_stopwords
+def cleanText(text, language, tokenizer=DEFAULT_TOKENIZER):
+    # Limpeza de um único texto; para vários textos use cleanTexts (em lote)
+    return cleanTexts([text], language, tokenizer)[0]
 
 # ---------------------------------------------------
 # 🌐 Coleta os posts de um usuário específico do Bluesky
 # ---------------------------------------------------
-def getUserFeedPlus(actor, limit, cursor=None):
-    url = "https://public.api.bsky.app/xrpc/app.bsky.feed.getAuthorFeed"
+def getUserFeedPlus(actor, limit, cursor=None, use_cache=True):
     params = {"actor": actor, "limit": limit}
     if cursor:
         params["cursor"] = cursor
 
-    try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Erro: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"Ocorreu um erro: {e}")
-        return None
+    return get_client().get("app.bsky.feed.getAuthorFeed", params, use_cache=use_cache)
 
 # ---------------------------------------------------
-# 🔍 Busca por posts com base em um termo de consulta
+# 🔢 Consulta vários posts de uma vez pelas URIs
 # ---------------------------------------------------
-def search_posts(query, limit):
-    url = "https://public.api.bsky.app/xrpc/app.bsky.feed.searchPosts"
-    params = {"q": query, "limit": limit}
-    try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Erro: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"Ocorreu um erro: {e}")
-        return None
+GET_POSTS_MAX_URIS = 25  # máximo aceito pelo endpoint app.bsky.feed.getPosts
+
+def getPosts(uris):
+    params = {"uris": list(uris)[:GET_POSTS_MAX_URIS]}
+    return get_client().get("app.bsky.feed.getPosts", params, use_cache=False)
 
 # ---------------------------------------------------
-# 📥 Função principal para coletar, limpar e organizar posts
+# 🔍 Busca por posts com base em um termo de consulta
 # ---------------------------------------------------
-def collectPosts(actor, limit, iterations, language):
-    all_posts = []
+def search_posts(query, limit, cursor=None):
+    params = {"q": query, "limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    return get_client().get("app.bsky.feed.searchPosts", params)
+
+def iterSearchPosts(query, max_posts, page_size=100):
+    """
+    Gera as páginas de resultados da busca seguindo o cursor até reunir
+    max_posts posts ou acabarem os resultados.
+    """
     cursor = None
+    collected = 0
 
-    for i in range(iterations):
-        print(f"Coletando lote {i + 1} de posts...")
-        result = getUserFeedPlus(actor, limit=limit, cursor=cursor)
+    while collected < max_posts:
+        result = search_posts(query, min(page_size, max_posts - collected), cursor=cursor)
         if not result:
             break
 
-        posts = result.get('feed', [])
-        cursor = result.get('cursor', None)
-
-        for post in posts:
-            # Coleta dados de engajamento
-            replyCount = post.get('post', {}).get('replyCount', 0)
-            repostCount = post.get('post', {}).get('repostCount', 0)
-            likeCount = post.get('post', {}).get('likeCount', 0)
-            quoteCount = post.get('post', {}).get('quoteCount', 0)
-            timestamp = post.get('post', {}).get('indexedAt')
-            total = replyCount + repostCount + likeCount + quoteCount
-
-            # Coleta texto e metadados
-            record = post.get('post', {}).get('record', {})
-            text = record.get('text')
-            author = post.get('post', {}).get('author', {})
-            embed = record.get('embed', {}).get('images', [])
-
-            # Verifica se o post tem imagem
-            image_ref = embed[0].get('image', {}).get('ref', {}).get('$link') if embed else None
-            image_ref = True if image_ref else False
-
-            if text:
-                original_text = text
-                tokens = cleanText(text, language)
-                clean = ' '.join(tokens)
-
-                postData = {
-                    'texto_original': original_text,
-                    'texto_limpo': clean,
-                    'tokens': tokens,
-                    'comentarios': replyCount,
-                    'likes': likeCount,
-                    'compartilhamentos': repostCount,
-                    'repostagens': quoteCount,
-                    'total': total,
-                    'data_hora': timestamp,
-                    'author_handle': author.get('handle', ''),
-                    'author_displayName': author.get('displayName', ''),
-                    'image_ref': image_ref
-                }
-                all_posts.append(postData)
+        posts = result.get('posts', [])[:max_posts - collected]
+        collected += len(posts)
+        if posts:
+            yield posts
 
-        if not cursor:
-            print("Fim dos dados disponíveis.")
+        cursor = result.get('cursor')
+        if not cursor or not posts:
             break
 
+# ---------------------------------------------------
+# 🧾 Converte um item do feed no registro usado pelas análises
+# ---------------------------------------------------
+def _parsePost(post):
+    # Coleta dados de engajamento
+    replyCount = post.get('post', {}).get('replyCount', 0)
+    repostCount = post.get('post', {}).get('repostCount', 0)
+    likeCount = post.get('post', {}).get('likeCount', 0)
+    quoteCount = post.get('post', {}).get('quoteCount', 0)
+    timestamp = post.get('post', {}).get('indexedAt')
+    total = replyCount + repostCount + likeCount + quoteCount
+
+    # Coleta texto e metadados
+    record = post.get('post', {}).get('record', {})
+    text = record.get('text')
+    author = post.get('post', {}).get('author', {})
+    embed = record.get('embed', {}).get('images', [])
+
+    # Verifica se o post tem imagem
+    image_ref = embed[0].get('image', {}).get('ref', {}).get('$link') if embed else None
+    image_ref = True if image_ref else False
+
+    if not text:
+        return None
+
+    # Idioma declarado pelo autor do post (usado para escolher stopwords)
+    langs = record.get('langs') or []
+
+    # Os campos texto_limpo e tokens são preenchidos em lote por cleanPosts
+    return {
+        'texto_original': text,
+        'texto_limpo': '',
+        'tokens': [],
+        'comentarios': replyCount,
+        'likes': likeCount,
+        'compartilhamentos': repostCount,
+        'repostagens': quoteCount,
+        'total': total,
+        'data_hora': timestamp,
+        'author_handle': author.get('handle', ''),
+        'author_displayName': author.get('displayName', ''),
+        'image_ref': image_ref,
+        'uri': post.get('post', {}).get('uri', ''),
+        'idioma': langs[0] if langs else ''
+    }
+
+def cleanPosts(batch, language, tokens_list=None, tokenizer=DEFAULT_TOKENIZER):
+    # Limpa e tokeniza o lote de uma só vez, agrupado pelo idioma de cada post
+    # (language é o padrão para posts sem idioma conhecido)
+    if tokens_list is None:
+        tokens_list = cleanTextsByLanguage([p['texto_original'] for p in batch],
+                                           [p.get('idioma') for p in batch], language, tokenizer)
+    for postData, tokens in zip(batch, tokens_list):
+        postData['tokens'] = tokens
+        postData['texto_limpo'] = ' '.join(tokens)
+    return batch
+
+# ---------------------------------------------------
+# 🌊 Coleta em fluxo: devolve os posts lote a lote
+# ---------------------------------------------------
+def iterPosts(actor, limit, iterations, language, max_posts=None, max_seconds=None, workers=None,
+              tokenizer=DEFAULT_TOKENIZER, chunksize=None):
+    """
+    Gera listas de posts já limpos, uma por página da API, assim que cada
+    página chega. Para ao fim do feed, após `iterations` páginas, ao atingir
+    max_posts posts ou ao passar max_seconds segundos.
+    Com workers, a tokenização roda em um pool de processos enquanto a próxima
+    página é baixada; a ordem dos lotes é mantida. Cada tarefa do pool recebe
+    uma página ou, com chunksize, blocos de chunksize posts (páginas são
+    juntadas ou divididas), e cada bloco é entregue como um lote.
+    tokenizer escolhe o backend de tokenização ('punkt' ou 'regex').
+    """
+    cursor = None
+    collected = 0
+    start = time.monotonic()
+    pool = makeCleaningPool(workers) if workers else None
+    pending = deque()
+    buffer = []  # posts aguardando completar um bloco de chunksize
+
+    def submit(chunk):
+        texts = [p['texto_original'] for p in chunk]
+        langs = [p['idioma'] for p in chunk]
+        pending.append((chunk, pool.submit(cleanTextsByLanguage, texts, langs, language, tokenizer)))
+
+    try:
+        for i in range(iterations):
+            if max_seconds is not None and time.monotonic() - start >= max_seconds:
+                print("Tempo máximo de coleta atingido.")
+                break
+
+            print(f"Coletando lote {i + 1} de posts...")
+            result = getUserFeedPlus(actor, limit=limit, cursor=cursor)
+            if not result:
+                break
+
+            posts = result.get('feed', [])
+            cursor = result.get('cursor', None)
+
+            batch = [postData for postData in map(_parsePost, posts) if postData]
+            if max_posts is not None:
+                batch = batch[:max_posts - collected]
+            collected += len(batch)
+            if batch:
+                if pool:
+                    if chunksize:
+                        buffer.extend(batch)
+                        while len(buffer) >= chunksize:
+                            submit(buffer[:chunksize])
+                            buffer = buffer[chunksize:]
+                    else:
+                        submit(batch)
+                    # Entrega os lotes que já terminaram, sempre na ordem de chegada
+                    while pending and pending[0][1].done():
+                        done_batch, future = pending.popleft()
+                        yield cleanPosts(done_batch, language, future.result())
+                else:
+                    yield cleanPosts(batch, language, tokenizer=tokenizer)
+
+            if max_posts is not None and collected >= max_posts:
+                print("Número máximo de posts atingido.")
+                break
+
+            if not cursor:
+                print("Fim dos dados disponíveis.")
+                break
+
+        if buffer:
+            submit(buffer)
+        while pending:
+            done_batch, future = pending.popleft()
+            yield cleanPosts(done_batch, language, future.result())
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+# ---------------------------------------------------
+# 📥 Função principal para coletar, limpar e organizar posts
+# ---------------------------------------------------
+def collectPosts(actor, limit, iterations, language, max_posts=None, max_seconds=None, workers=None,
+                 tokenizer=DEFAULT_TOKENIZER, chunksize=None):
+    all_posts = []
+    for batch in iterPosts(actor, limit, iterations, language, max_posts, max_seconds, workers, tokenizer, chunksize):
+        all_posts.extend(batch)
+
     print(f"Total de posts coletados: {len(all_posts)}")
     return all_posts
 
@@ -181,30 +255,48 @@ if st.button("Analisar"):
 # ---------------------------------------------------
 # 👥 Funções para obter seguidores e seguidos de um usuário
 # ---------------------------------------------------
-def getUserFollows(actor, limit):
-    url = "https://public.api.bsky.app/xrpc/app.bsky.graph.getFollows"
+def getUserFollows(actor, limit, cursor=None):
     params = {"actor": actor, "limit": limit}
-    try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Erro: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"Ocorreu um erro: {e}")
-        return None
+    if cursor:
+        params["cursor"] = cursor
+    return get_client().get("app.bsky.graph.getFollows", params)
 
-def getUserFollowers(actor, limit):
-    url = "https://public.api.bsky.app/xrpc/app.bsky.graph.getFollowers"
+def getUserFollowers(actor, limit, cursor=None):
     params = {"actor": actor, "limit": limit}
-    try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Erro: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"Ocorreu um erro: {e}")
-        return None
+    if cursor:
+        params["cursor"] = cursor
+    return get_client().get("app.bsky.graph.getFollowers", params)
+
+# ---------------------------------------------------
+# 📑 Paginação completa de seguidores e seguidos
+# ---------------------------------------------------
+def _iterGraphPages(fetch, key, actor, limit, max_pages):
+    # Segue o cursor da API e devolve apenas os handles de cada página
+    cursor = None
+    pages = 0
+
+    while max_pages is None or pages < max_pages:
+        result = fetch(actor, limit, cursor=cursor)
+        if not result:
+            break
+
+        handles = [profile.get('handle') for profile in result.get(key, []) if profile.get('handle')]
+        pages += 1
+        if handles:
+            yield handles
+
+        cursor = result.get('cursor')
+        if not cursor:
+            break
+
+def iterUserFollows(actor, limit=100, max_pages=None):
+    """
+    Gera, página a página, os handles dos perfis seguidos pelo usuário.
+    """
+    return _iterGraphPages(getUserFollows, 'follows', actor, limit, max_pages)
+
+def iterUserFollowers(actor, limit=100, max_pages=None):
+    """
+    Gera, página a página, os handles dos seguidores do usuário.
+    """
+    return _iterGraphPages(getUserFollowers, 'followers', actor, limit, max_pages)
@@ -0,0 +1,142 @@
+# ---------------------------------------------------
+# 📦 Importações de bibliotecas necessárias
+# ---------------------------------------------------
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+
+# ---------------------------------------------------
+# ⚙️ Configurações padrão do cache
+# ---------------------------------------------------
+CACHE_PATH = os.environ.get(
+    "BSKY_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "bluesky.sqlite"),
+)
+
+# Tempo de vida (em segundos) das respostas de cada endpoint; 0 desativa o cache
+DEFAULT_TTLS = {
+    "app.bsky.feed.getAuthorFeed": 10 * 60,
+    "app.bsky.feed.searchPosts": 5 * 60,
+    "app.bsky.graph.getFollows": 60 * 60,
+    "app.bsky.graph.getFollowers": 60 * 60,
+    "app.bsky.feed.getPosts": 0,  # usado para atualizar métricas; sempre vai à rede
+}
+DEFAULT_TTL = 5 * 60
+MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+# ---------------------------------------------------
+# 💾 Cache persistente de respostas em SQLite
+# ---------------------------------------------------
+class ResponseCache:
+    """
+    Guarda em disco as respostas JSON da API, indexadas por servidor (base_url),
+    endpoint e parâmetros (incluindo o cursor). Cada endpoint tem seu próprio TTL e, quando o arquivo
+    passa de max_bytes, as entradas acessadas há mais tempo são removidas (LRU).
+    """
+
+    def __init__(self, path=CACHE_PATH, ttls=None, default_ttl=DEFAULT_TTL, max_bytes=MAX_BYTES):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)")
+        self.conn.commit()
+
+    def ttl(self, endpoint):
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    @staticmethod
+    def make_key(endpoint, params, base_url=""):
+        # Ordena os parâmetros para que a mesma consulta gere sempre a mesma chave;
+        # o servidor entra na chave para que respostas do mock não sirvam à API real
+        raw = json.dumps([base_url, endpoint, sorted((params or {}).items())], default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, endpoint, params, base_url=""):
+        """
+        Retorna a resposta guardada ou None se não existir ou estiver expirada.
+        """
+        if self.ttl(endpoint) <= 0:
+            return None
+
+        key = self.make_key(endpoint, params, base_url)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+            self.conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, endpoint, params, data, base_url=""):
+        ttl = self.ttl(endpoint)
+        if ttl <= 0:
+            return
+
+        key = self.make_key(endpoint, params, base_url)
+        body = zlib.compress(json.dumps(data).encode("utf-8"))
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, size, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, len(body), now + ttl, now),
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        # 🧹 Remove expirados e, se ainda exceder o limite, os menos usados recentemente
+        self.conn.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        removed = 0
+        keys = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY accessed ASC"):
+            keys.append((key,))
+            removed += size
+            if removed >= excess:
+                break
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,193 @@
+# ---------------------------------------------------
+# 📦 Importações de bibliotecas necessárias
+# ---------------------------------------------------
+import os
+import time
+import threading
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+
+# ---------------------------------------------------
+# ⚙️ Configurações padrão do cliente XRPC
+# ---------------------------------------------------
+# Pode apontar para outro servidor (ex: o mock local em api/mock_server.py) via BSKY_API_URL
+BASE_URL = os.environ.get("BSKY_API_URL", "https://public.api.bsky.app/xrpc")
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RATE_LIMIT = 10  # requisições por segundo (a AppView pública aceita ~3000 a cada 5 min)
+
+# ---------------------------------------------------
+# 🚦 Limitador de taxa (token bucket) seguro entre threads
+# ---------------------------------------------------
+class RateLimiter:
+    """
+    Limita o número de requisições por segundo, compartilhado entre todas as
+    threads que usam o mesmo cliente.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # Bloqueia até haver uma ficha disponível no balde
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# ---------------------------------------------------
+# 🌐 Cliente HTTP compartilhado para a API do Bluesky
+# ---------------------------------------------------
+class XRPCClient:
+    """
+    Cliente para os endpoints XRPC do Bluesky.
+    Reaproveita conexões (keep-alive), aplica timeout em todas as chamadas e
+    repete requisições com backoff exponencial em erros 429/5xx e falhas de rede,
+    respeitando os cabeçalhos Retry-After e RateLimit-Reset do servidor.
+    Se um ResponseCache for informado, respostas válidas são lidas do disco
+    antes de ir à rede.
+    """
+
+    def __init__(self, base_url=BASE_URL, timeout=(5, 30), max_retries=5,
+                 backoff_factor=0.5, max_backoff=60, pool_size=20, rate_limit=RATE_LIMIT,
+                 cache=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.cache = cache
+
+        # 🔌 Sessão com pool de conexões reaproveitadas entre as chamadas
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _backoff(self, attempt):
+        # Backoff exponencial: 0.5s, 1s, 2s, 4s... limitado a max_backoff
+        return min(self.backoff_factor * (2 ** attempt), self.max_backoff)
+
+    def _wait_time(self, response, attempt):
+        # ⏳ Usa o tempo indicado pelo servidor quando disponível
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                try:
+                    wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                    return min(max(wait, 0), self.max_backoff)
+                except (TypeError, ValueError):
+                    pass
+
+        # O Bluesky informa em RateLimit-Reset o instante (epoch) de renovação da cota
+        reset = response.headers.get('RateLimit-Reset')
+        if response.status_code == 429 and reset:
+            try:
+                return min(max(float(reset) - time.time(), 0), self.max_backoff)
+            except ValueError:
+                pass
+
+        return self._backoff(attempt)
+
+    def get(self, method, params=None, use_cache=True):
+        """
+        Executa um GET no endpoint XRPC informado (ex: 'app.bsky.feed.getAuthorFeed').
+        Retorna o JSON da resposta ou None em caso de erro definitivo.
+        use_cache=False ignora o cache na leitura, mas ainda grava a resposta nova.
+        """
+        if self.cache is not None and use_cache:
+            cached = self.cache.get(method, params, self.base_url)
+            if cached is not None:
+                return cached
+
+        data = self._request(method, params)
+        if data is not None and self.cache is not None:
+            self.cache.set(method, params, data, self.base_url)
+        return data
+
+    def _request(self, method, params):
+        url = f"{self.base_url}/{method}"
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt < self.max_retries:
+                    time.sleep(self._backoff(attempt))
+                    continue
+                print(f"Ocorreu um erro: {e}")
+                return None
+            except Exception as e:
+                print(f"Ocorreu um erro: {e}")
+                return None
+
+            if response.status_code == 200:
+                try:
+                    return response.json()
+                except ValueError as e:
+                    print(f"Ocorreu um erro: {e}")
+                    return None
+
+            if response.status_code in RETRY_STATUS and attempt < self.max_retries:
+                time.sleep(self._wait_time(response, attempt))
+                continue
+
+            print(f"Erro: {response.status_code} - {response.text}")
+            return None
+
+        return None
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+# ---------------------------------------------------
+# 🔁 Instância única compartilhada pelo módulo da API
+# ---------------------------------------------------
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """
+    Retorna o cliente compartilhado, criando-o na primeira chamada.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = XRPCClient(cache=ResponseCache())
+        return _client
+
+def configure_client(**kwargs):
+    """
+    Substitui o cliente compartilhado por um novo com as opções informadas
+    (ex: timeout, max_retries, backoff_factor, pool_size, rate_limit, cache).
+    Sem o argumento cache, o novo cliente usa o cache em disco padrão;
+    cache=None desativa o cache.
+    """
+    if "cache" not in kwargs:
+        kwargs["cache"] = ResponseCache()
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = XRPCClient(**kwargs)
+        return _client
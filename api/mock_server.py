@@ -0,0 +1,238 @@
+# ---------------------------------------------------
+# 📦 Importações de bibliotecas necessárias
+# ---------------------------------------------------
+import os
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# ---------------------------------------------------
+# 🧪 Servidor XRPC local para testes e medições offline
+# ---------------------------------------------------
+# Serve getAuthorFeed, searchPosts, getFollows, getFollowers e getPosts com a
+# mesma estrutura de resposta da API pública, a partir de dados sintéticos
+# determinísticos ou de fixtures gravadas em JSON. Permite simular latência e
+# respostas 429 para medir o desempenho dos coletores e o comportamento de retry.
+#
+# Uso:
+#   python -m api.mock_server --port 8787 --latency 0.05 --error-rate 0.1
+#   BSKY_API_URL=http://127.0.0.1:8787/xrpc streamlit run main.py
+#
+# Fixtures gravadas: um diretório com arquivos <endpoint>.json, por exemplo
+# app.bsky.feed.getAuthorFeed.json, contendo um objeto {ator_ou_termo: [itens]}
+# com os itens de 'feed', 'posts', 'follows' ou 'followers' na ordem da API.
+
+WORDS = [
+    "president", "election", "economy", "market", "climate", "policy", "court", "school",
+    "health", "world", "city", "trump", "senate", "report", "study", "war", "trade", "music",
+    "futebol", "governo", "eleição", "economia", "cidade", "saúde", "escola", "mundo",
+    "California", "Texas", "New York", "Florida", "Ohio", "Georgia", "Virginia", "West Virginia",
+]
+BASE_TIME = datetime(2025, 2, 9, 16, 0, tzinfo=timezone.utc)
+ITEM_KEYS = {
+    "app.bsky.feed.getAuthorFeed": "feed",
+    "app.bsky.feed.searchPosts": "posts",
+    "app.bsky.graph.getFollows": "follows",
+    "app.bsky.graph.getFollowers": "followers",
+}
+
+def _rng(*parts):
+    # Gerador aleatório estável para a mesma combinação de argumentos
+    return random.Random(zlib.crc32("|".join(map(str, parts)).encode("utf-8")))
+
+# ---------------------------------------------------
+# 🏭 Geração de dados sintéticos
+# ---------------------------------------------------
+class SyntheticData:
+    """
+    Gera posts e perfis determinísticos: o mesmo ator e índice produzem
+    sempre o mesmo post, então a paginação é consistente entre chamadas.
+    """
+
+    def __init__(self, posts_per_actor=1000, search_results=1000, profiles_per_actor=500, population=50000):
+        self.posts_per_actor = posts_per_actor
+        self.search_results = search_results
+        self.profiles_per_actor = profiles_per_actor
+        self.population = population
+
+    def post(self, actor, index, query=None):
+        rng = _rng(actor, index)
+        words = rng.sample(WORDS, rng.randint(5, 14))
+        if query:
+            words.insert(rng.randint(0, len(words)), query)
+        lang = "pt" if rng.random() < 0.3 else "en"
+        indexed_at = (BASE_TIME - timedelta(minutes=30 * index)).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        return {
+            "uri": f"at://{actor}/app.bsky.feed.post/{index}",
+            "cid": f"cid{zlib.crc32(f'{actor}{index}'.encode('utf-8'))}",
+            "author": {"did": f"did:plc:{actor}", "handle": actor, "displayName": actor.split(".")[0].title()},
+            "record": {
+                "$type": "app.bsky.feed.post",
+                "text": " ".join(words) + f" https://example.com/{index}",
+                "createdAt": indexed_at,
+                "langs": [lang],
+            },
+            "replyCount": rng.randint(0, 50),
+            "repostCount": rng.randint(0, 80),
+            "likeCount": rng.randint(0, 400),
+            "quoteCount": rng.randint(0, 10),
+            "indexedAt": indexed_at,
+        }
+
+    def items(self, endpoint, key):
+        if endpoint == "app.bsky.feed.getAuthorFeed":
+            return self.posts_per_actor, lambda i: {"post": self.post(key, i)}
+        if endpoint == "app.bsky.feed.searchPosts":
+            return self.search_results, lambda i: self.post(f"user{_rng(key, i).randrange(self.population)}.mock", i, query=key)
+        return self.profiles_per_actor, lambda i: self.profile(key, endpoint, i)
+
+    def profile(self, actor, endpoint, index):
+        n = _rng(actor, endpoint, index).randrange(self.population)
+        return {"did": f"did:plc:user{n}", "handle": f"user{n}.mock", "displayName": f"User {n}"}
+
+class FixtureData:
+    """
+    Serve respostas a partir de fixtures gravadas (ver formato no topo do arquivo).
+    """
+
+    def __init__(self, directory):
+        self.fixtures = {}
+        for endpoint in ITEM_KEYS:
+            path = os.path.join(directory, f"{endpoint}.json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self.fixtures[endpoint] = json.load(f)
+
+    def items(self, endpoint, key):
+        items = self.fixtures.get(endpoint, {}).get(key, [])
+        return len(items), lambda i: items[i]
+
+    def post(self, actor, index, query=None):
+        for item in self.fixtures.get("app.bsky.feed.getAuthorFeed", {}).get(actor, []):
+            if item.get("post", {}).get("uri", "").endswith(f"/{index}"):
+                return item["post"]
+        return None
+
+# ---------------------------------------------------
+# 🌐 Handler HTTP dos endpoints XRPC
+# ---------------------------------------------------
+class MockXRPCHandler(BaseHTTPRequestHandler):
+    server_version = "MockXRPC/1.0"
+
+    def log_message(self, format, *args):
+        pass  # silencia o log de cada requisição
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        config = self.server.config
+        stats = self.server.stats
+        with self.server.lock:
+            stats["requests"] += 1
+
+        # ⏳ Latência simulada
+        if config["latency"]:
+            time.sleep(config["latency"] + random.uniform(0, config["jitter"]))
+
+        # 🚦 Injeção de 429 com cabeçalhos de rate limit
+        if config["error_rate"] and random.random() < config["error_rate"]:
+            with self.server.lock:
+                stats["429"] += 1
+            reset = int(time.time() + config["retry_after"])
+            self._send(429, {"error": "RateLimitExceeded", "message": "Rate Limit Exceeded"}, {
+                "Retry-After": str(config["retry_after"]),
+                "RateLimit-Limit": "3000",
+                "RateLimit-Remaining": "0",
+                "RateLimit-Reset": str(reset),
+            })
+            return
+
+        url = urlparse(self.path)
+        method = url.path.rsplit("/", 1)[-1]
+        params = parse_qs(url.query)
+        data = self.server.data
+
+        if method == "app.bsky.feed.getPosts":
+            posts = []
+            for uri in params.get("uris", [])[:25]:
+                actor, _, index = uri.replace("at://", "").partition("/app.bsky.feed.post/")
+                post = data.post(actor, int(index)) if index.isdigit() else None
+                if post:
+                    posts.append(post)
+            self._send(200, {"posts": posts})
+            return
+
+        if method not in ITEM_KEYS:
+            self._send(404, {"error": "MethodNotImplemented", "message": f"{method} não é servido pelo mock"})
+            return
+
+        key = (params.get("q") or params.get("actor") or [""])[0]
+        limit = min(int((params.get("limit") or ["50"])[0]), 100)
+        offset = int((params.get("cursor") or ["0"])[0])
+
+        total, make_item = data.items(method, key)
+        end = min(offset + limit, total)
+        payload = {ITEM_KEYS[method]: [make_item(i) for i in range(offset, end)]}
+        if end < total:
+            payload["cursor"] = str(end)
+        if method in ("app.bsky.graph.getFollows", "app.bsky.graph.getFollowers"):
+            payload["subject"] = {"did": f"did:plc:{key}", "handle": key}
+        self._send(200, payload)
+
+# ---------------------------------------------------
+# 🚀 Inicialização do servidor
+# ---------------------------------------------------
+def startServer(host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                retry_after=1, fixtures=None, **synthetic_options):
+    """
+    Inicia o servidor em uma thread de fundo e o retorna. A URL base para o
+    cliente fica em server.base_url e as contagens de requisições e 429
+    injetados em server.stats. Use server.shutdown() para encerrar.
+    """
+    server = ThreadingHTTPServer((host, port), MockXRPCHandler)
+    server.daemon_threads = True
+    server.config = {"latency": latency, "jitter": jitter, "error_rate": error_rate, "retry_after": retry_after}
+    server.data = FixtureData(fixtures) if fixtures else SyntheticData(**synthetic_options)
+    server.stats = {"requests": 0, "429": 0}
+    server.lock = threading.Lock()
+    server.base_url = f"http://{host}:{server.server_address[1]}/xrpc"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor XRPC local que imita a API pública do Bluesky.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="latência fixa por requisição (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latência aleatória extra máxima (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de requisições respondidas com 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="segundos informados no Retry-After dos 429")
+    parser.add_argument("--fixtures", default=None, help="diretório com fixtures gravadas")
+    parser.add_argument("--posts-per-actor", type=int, default=1000)
+    args = parser.parse_args()
+
+    extra = {} if args.fixtures else {"posts_per_actor": args.posts_per_actor}
+    server = startServer(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                         args.retry_after, args.fixtures, **extra)
+    print(f"Mock XRPC rodando em {server.base_url} (Ctrl+C para sair)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
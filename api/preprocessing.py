@@ -0,0 +1,163 @@
+# ---------------------------------------------------
+# 📦 Importações de bibliotecas necessárias
+# ---------------------------------------------------
+import re
+import os
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor
+
+import nltk
+import pandas as pd
+
+# ---------------------------------------------------
+# ⚙️ Padrões e mapeamentos pré-compilados
+# ---------------------------------------------------
+# Mapeia siglas de idioma (como em record.langs) para formatos reconhecidos pelo NLTK
+LANGUAGE_MAP = {
+    "pt": "portuguese", "en": "english", "es": "spanish", "fr": "french", "de": "german",
+    "it": "italian", "nl": "dutch", "sv": "swedish", "da": "danish", "no": "norwegian",
+    "fi": "finnish", "ru": "russian", "tr": "turkish",
+}
+
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', re.MULTILINE)
+# Pontuação e números em uma única passada (equivale a removê-los em sequência)
+NON_WORD_PATTERN = re.compile(r'[^\w\s]|\d+')
+
+# Tokenizadores disponíveis: 'punkt' (nltk.word_tokenize) ou 'regex' (leve, sem modelos)
+TOKENIZERS = ('punkt', 'regex')
+DEFAULT_TOKENIZER = 'punkt'
+
+# ---------------------------------------------------
+# 📚 Recursos do NLTK carregados uma vez por idioma
+# ---------------------------------------------------
+@lru_cache(maxsize=None)
+def getStopwords(language):
+    """
+    Retorna o conjunto imutável de stopwords do idioma (inglês se não houver lista).
+    """
+    language = LANGUAGE_MAP.get(language, language)
+    fileids = nltk.corpus.stopwords.fileids()
+    return frozenset(nltk.corpus.stopwords.words(language if language in fileids else 'english'))
+
+@lru_cache(maxsize=None)
+def _availableLanguages():
+    return frozenset(nltk.corpus.stopwords.fileids())
+
+@lru_cache(maxsize=None)
+def resolveLanguage(code, default):
+    """
+    Converte a sigla de idioma de um post (ex: 'pt-BR') no nome usado pelo NLTK.
+    Idiomas ausentes ou sem stopwords instaladas usam o idioma padrão da análise.
+    """
+    default = LANGUAGE_MAP.get(default, default)
+    if not code:
+        return default
+    language = LANGUAGE_MAP.get(code.split('-')[0].lower())
+    return language if language in _availableLanguages() else default
+
+@lru_cache(maxsize=None)
+def getTokenizer(name, language):
+    """
+    Retorna a função de tokenização do backend escolhido para o idioma.
+    'regex' apenas extrai as palavras do texto já sem pontuação; 'punkt' usa o
+    nltk.word_tokenize e recorre à separação por espaço se o modelo não existir.
+    """
+    if name not in TOKENIZERS:
+        raise ValueError(f"Tokenizador desconhecido: '{name}'. Opções: {', '.join(TOKENIZERS)}")
+
+    if name == 'regex':
+        # Depois de normalizeText só restam caracteres \w e espaços, então separar
+        # por espaço dá o mesmo resultado que \w+ e é mais rápido
+        return str.split
+
+    # Verifica uma única vez se o punkt do idioma está disponível
+    try:
+        nltk.word_tokenize("teste", language=language)
+    except LookupError:
+        print(f"Erro: Não foi possível encontrar os recursos de tokenização para '{language}'.")
+        return str.split  # Fallback: separação simples por espaço
+    return lambda text: nltk.word_tokenize(text, language=language)
+
+# ---------------------------------------------------
+# 🧹 Limpeza e tokenização em lote
+# ---------------------------------------------------
+def normalizeText(text):
+    # Minúsculas, sem URLs, pontuação ou números
+    text = URL_PATTERN.sub('', text.lower())
+    return NON_WORD_PATTERN.sub('', text)
+
+def cleanTexts(texts, language, tokenizer=DEFAULT_TOKENIZER):
+    """
+    Limpa e tokeniza um lote de textos (lista ou Series) removendo URLs,
+    pontuação, números e stopwords. Stopwords e tokenizador são carregados uma
+    única vez por idioma. Devolve uma lista de listas de tokens (ou uma Series
+    com o mesmo índice, se a entrada for uma Series).
+    """
+    language = LANGUAGE_MAP.get(language, language)
+    stop_words = getStopwords(language)
+    tokenize = getTokenizer(tokenizer, language)
+
+    tokens = [
+        [word for word in tokenize(normalizeText(text)) if word not in stop_words]
+        if isinstance(text, str) else []
+        for text in texts
+    ]
+
+    if isinstance(texts, pd.Series):
+        return pd.Series(tokens, index=texts.index, dtype=object)
+    return tokens
+
+def cleanTextsByLanguage(texts, langs, default_language, tokenizer=DEFAULT_TOKENIZER):
+    """
+    Limpa cada texto com os recursos do seu próprio idioma (ex: record.langs do
+    post). Os textos são agrupados por idioma e cada grupo é limpo em um único
+    lote; a saída mantém a ordem de entrada.
+    """
+    texts = list(texts)
+    groups = {}
+    for position, code in enumerate(langs):
+        groups.setdefault(resolveLanguage(code, default_language), []).append(position)
+
+    tokens = [None] * len(texts)
+    for language, positions in groups.items():
+        for position, group_tokens in zip(positions, cleanTexts([texts[p] for p in positions], language, tokenizer)):
+            tokens[position] = group_tokens
+    return tokens
+
+# ---------------------------------------------------
+# ⚡ Tokenização paralela em um pool de processos
+# ---------------------------------------------------
+def _initWorker(nltk_paths):
+    # Cada processo herda os caminhos locais do NLTK do processo principal
+    for path in nltk_paths:
+        if path not in nltk.data.path:
+            nltk.data.path.append(path)
+
+def makeCleaningPool(workers=None):
+    """
+    Cria o pool de processos usado na limpeza paralela (workers=None usa todos os núcleos).
+    """
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                               initializer=_initWorker, initargs=(list(nltk.data.path),))
+
+def cleanTextsParallel(texts, language, workers=None, chunksize=500, pool=None, tokenizer=DEFAULT_TOKENIZER):
+    """
+    Mesma saída de cleanTexts, mas com os textos divididos em blocos de
+    `chunksize` e tokenizados em paralelo. A ordem original é preservada.
+    Lotes pequenos (um único bloco) são processados no próprio processo.
+    """
+    items = list(texts)
+    if len(items) <= chunksize:
+        tokens = cleanTexts(items, language, tokenizer)
+    else:
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        executor = pool or makeCleaningPool(workers)
+        try:
+            tokens = [t for chunk in executor.map(partial(cleanTexts, language=language, tokenizer=tokenizer), chunks) for t in chunk]
+        finally:
+            if pool is None:
+                executor.shutdown()
+
+    if isinstance(texts, pd.Series):
+        return pd.Series(tokens, index=texts.index, dtype=object)
+    return tokens
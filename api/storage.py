@@ -0,0 +1,112 @@
+# ---------------------------------------------------
+# 📦 Importações de bibliotecas necessárias
+# ---------------------------------------------------
+import os
+import ast
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ---------------------------------------------------
+# 🧱 Esquema colunar dos posts coletados
+# ---------------------------------------------------
+# Tokens como list<string> nativo, métricas inteiras, data em UTC e textos
+# repetidos (autor) com codificação por dicionário.
+POST_SCHEMA = {
+    "texto_original": pa.string(),
+    "texto_limpo": pa.string(),
+    "tokens": pa.list_(pa.string()),
+    "comentarios": pa.int32(),
+    "likes": pa.int32(),
+    "compartilhamentos": pa.int32(),
+    "repostagens": pa.int32(),
+    "total": pa.int32(),
+    "data_hora": pa.timestamp("ms", tz="UTC"),
+    "author_handle": pa.dictionary(pa.int32(), pa.string()),
+    "author_displayName": pa.dictionary(pa.int32(), pa.string()),
+    "image_ref": pa.bool_(),
+    "uri": pa.string(),
+    "tema": pa.string(),
+    "idioma": pa.dictionary(pa.int32(), pa.string()),
+}
+COUNT_COLUMNS = ["comentarios", "likes", "compartilhamentos", "repostagens", "total"]
+
+def _parseTokens(value):
+    # Lê a lista de tokens gravada como texto no CSV antigo, sem usar eval
+    if isinstance(value, str):
+        try:
+            return list(ast.literal_eval(value))
+        except (ValueError, SyntaxError):
+            return value.split()
+    return list(value) if value is not None and not isinstance(value, float) else []
+
+def toTable(df):
+    """
+    Converte o DataFrame de posts em uma tabela Arrow com os tipos do POST_SCHEMA.
+    Colunas desconhecidas são mantidas com o tipo inferido.
+    """
+    df = df.copy()
+    if "tokens" in df.columns:
+        df["tokens"] = df["tokens"].apply(_parseTokens)
+    if "data_hora" in df.columns:
+        df["data_hora"] = pd.to_datetime(df["data_hora"], utc=True, errors="coerce", format="ISO8601")
+    for column in COUNT_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").fillna(0)
+    if "image_ref" in df.columns:
+        df["image_ref"] = df["image_ref"].fillna(False).astype(bool)
+
+    fields = []
+    for column in df.columns:
+        if column in POST_SCHEMA:
+            fields.append(pa.field(column, POST_SCHEMA[column]))
+        else:
+            fields.append(pa.field(column, pa.Schema.from_pandas(df[[column]], preserve_index=False).field(column).type))
+    return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+
+# ---------------------------------------------------
+# 💾 Gravação e leitura dos posts em Parquet
+# ---------------------------------------------------
+def savePosts(df, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    pq.write_table(toTable(df), path, compression="zstd")
+
+def toParquetBytes(df):
+    # Gera o arquivo Parquet em memória (usado nos botões de download)
+    buffer = pa.BufferOutputStream()
+    pq.write_table(toTable(df), buffer, compression="zstd")
+    return buffer.getvalue().to_pybytes()
+
+def loadPosts(path, columns=None):
+    """
+    Lê um conjunto de posts. Em Parquet, apenas as colunas pedidas são lidas
+    do disco; CSVs antigos também são aceitos (tokens convertidos sem eval).
+    """
+    if path.endswith(".csv"):
+        df = pd.read_csv(path, usecols=columns)
+        if "tokens" in df.columns:
+            df["tokens"] = df["tokens"].apply(_parseTokens)
+        return df
+
+    table = pq.read_table(path, columns=columns)
+    tokens = table.column("tokens").to_pylist() if "tokens" in table.column_names else None
+    df = table.drop(["tokens"]).to_pandas() if tokens is not None else table.to_pandas()
+    if tokens is not None:
+        position = table.column_names.index("tokens")
+        df.insert(position, "tokens", pd.Series(tokens, index=df.index, dtype=object))
+    return df
+
+def convertCsv(csv_path, parquet_path=None):
+    """
+    Converte um CSV de posts (com tokens em texto) para Parquet e devolve o caminho gerado.
+    """
+    parquet_path = parquet_path or os.path.splitext(csv_path)[0] + ".parquet"
+    savePosts(loadPosts(csv_path), parquet_path)
+    return parquet_path
+
+if __name__ == "__main__":
+    # Uso: python -m api.storage output/wsj.csv [output/wsj.parquet]
+    destino = convertCsv(*sys.argv[1:3])
+    print(f"Convertido: {sys.argv[1]} -> {destino} ({os.path.getsize(destino)} bytes)")
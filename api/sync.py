@@ -0,0 +1,203 @@
+# ---------------------------------------------------
+# 📦 Importações de bibliotecas necessárias
+# ---------------------------------------------------
+import os
+import json
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .blueskyApi import getUserFeedPlus, getPosts, cleanPosts, _parsePost, GET_POSTS_MAX_URIS
+from .storage import loadPosts, savePosts
+from .preprocessing import DEFAULT_TOKENIZER
+
+# ---------------------------------------------------
+# ⚙️ Locais dos dados sincronizados
+# ---------------------------------------------------
+SYNC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output")
+STATE_PATH = os.path.join(SYNC_DIR, "sync_state.json")
+
+def datasetPath(actor):
+    return os.path.join(SYNC_DIR, f"{actor}.parquet")
+
+# ---------------------------------------------------
+# 🗂️ Estado da sincronização (post mais recente por ator)
+# ---------------------------------------------------
+def loadState(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def saveState(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def loadDataset(path):
+    """
+    Lê o conjunto de posts já salvo (ou um DataFrame vazio se não existir).
+    Um CSV de versões anteriores com o mesmo nome é lido se ainda não houver Parquet.
+    """
+    legacy_csv = os.path.splitext(path)[0] + ".csv"
+    if not os.path.exists(path) and os.path.exists(legacy_csv):
+        path = legacy_csv
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return loadPosts(path)
+
+def _parseTime(value):
+    # Converte o indexedAt (ISO 8601) em datetime comparável
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+def _sortTime(item):
+    # Reposts aparecem no feed pela data do repost, não do post original
+    reason = item.get("reason") or {}
+    return _parseTime(reason.get("indexedAt") or item.get("post", {}).get("indexedAt"))
+
+# ---------------------------------------------------
+# 🔄 Sincronização incremental do feed de um ator
+# ---------------------------------------------------
+def syncPosts(actor, language, limit=100, max_iterations=100, path=None, state_path=STATE_PATH,
+              tokenizer=DEFAULT_TOKENIZER):
+    """
+    Busca apenas os posts publicados desde a última sincronização do ator.
+    Pagina o feed até encontrar um post já conhecido (pela data ou pela URI),
+    junta os novos ao conjunto salvo sem duplicar URIs e grava o resultado em Parquet.
+    A marca de tempo só avança quando a paginação chega ao trecho já conhecido
+    ou ao fim do feed.
+    tokenizer escolhe o backend de tokenização dos posts novos ('punkt' ou 'regex').
+    Retorna o DataFrame completo e a quantidade de posts novos.
+    """
+    path = path or datasetPath(actor)
+    state = loadState(state_path)
+    newest_known = _parseTime(state.get(actor))
+    dataset = loadDataset(path)
+    known_uris = set(dataset["uri"].dropna()) if "uri" in dataset.columns else set()
+
+    new_posts = []
+    newest_seen = newest_known
+    cursor = None
+    complete = False  # só fica True se a paginação chegou a um post conhecido ou ao fim do feed
+
+    for i in range(max_iterations):
+        print(f"Sincronizando lote {i + 1} de posts...")
+        result = getUserFeedPlus(actor, limit=limit, cursor=cursor, use_cache=False)
+        if not result:
+            break
+
+        reached_known = False
+        for item in result.get("feed", []):
+            sort_time = _sortTime(item)
+            if sort_time and (newest_seen is None or sort_time > newest_seen):
+                newest_seen = sort_time
+
+            uri = item.get("post", {}).get("uri")
+            if newest_known and sort_time and sort_time <= newest_known:
+                reached_known = True
+                continue
+            if uri in known_uris:
+                # Com a marca de tempo, posts já salvos são apenas pulados (podem vir de uma
+                # sincronização anterior interrompida); sem ela, indicam o fim dos posts novos
+                if newest_known is None:
+                    reached_known = True
+                continue
+
+            postData = _parsePost(item)
+            if postData:
+                new_posts.append(postData)
+
+        cursor = result.get("cursor")
+        if reached_known or not cursor:
+            complete = True
+            break
+
+    cleanPosts(new_posts, language, tokenizer=tokenizer)
+
+    # 🔗 Junta os novos posts aos já salvos, mantendo a versão mais recente de cada URI
+    merged = pd.concat([pd.DataFrame(new_posts), dataset], ignore_index=True)
+    if "uri" in merged.columns:
+        has_uri = merged["uri"].notna() & (merged["uri"] != "")
+        merged = merged[~(has_uri & merged["uri"].duplicated(keep="first"))]
+    if "data_hora" in merged.columns:
+        merged["data_hora"] = pd.to_datetime(merged["data_hora"], utc=True, format="ISO8601")
+        merged = merged.sort_values("data_hora", ascending=False, ignore_index=True)
+
+    if not merged.empty:
+        savePosts(merged, path)
+
+    # ⚠️ Se a paginação parou antes (erro na API ou limite de iterações), mantém a
+    # marca anterior: a próxima sincronização pagina até ela de novo e busca o
+    # intervalo que faltou (os posts já salvos são pulados pela URI)
+    if complete and newest_seen is not None:
+        state[actor] = newest_seen.isoformat()
+        saveState(state, state_path)
+    elif not complete:
+        print("Sincronização incompleta: a marca do último post sincronizado não foi alterada.")
+
+    print(f"Posts novos sincronizados: {len(new_posts)}")
+    return merged, len(new_posts)
+
+# ---------------------------------------------------
+# 📊 Atualização em lote das métricas de engajamento
+# ---------------------------------------------------
+METRIC_FIELDS = {
+    "comentarios": "replyCount",
+    "likes": "likeCount",
+    "compartilhamentos": "repostCount",
+    "repostagens": "quoteCount",
+}
+
+def _fetchCounts(uris):
+    # Lê os contadores atuais de um lote de até 25 posts
+    result = getPosts(uris)
+    if not result:
+        return {}
+    return {
+        post.get("uri"): {column: post.get(field, 0) for column, field in METRIC_FIELDS.items()}
+        for post in result.get("posts", [])
+    }
+
+def refreshEngagement(df, max_workers=8):
+    """
+    Relê curtidas, respostas, reposts e citações dos posts já coletados usando
+    app.bsky.feed.getPosts em lotes de 25 URIs executados em paralelo.
+    Apenas as colunas de métricas (e o total) são reescritas; posts que não
+    forem encontrados (ex: apagados) mantêm os valores anteriores.
+    """
+    if df.empty or "uri" not in df.columns:
+        return df
+
+    uris = [uri for uri in df["uri"].dropna().unique() if uri]
+    batches = [uris[i:i + GET_POSTS_MAX_URIS] for i in range(0, len(uris), GET_POSTS_MAX_URIS)]
+
+    counts = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch_counts in executor.map(_fetchCounts, batches):
+            counts.update(batch_counts)
+
+    if not counts:
+        return df
+
+    df = df.copy()
+    updates = pd.DataFrame.from_dict(counts, orient="index")
+    found = df["uri"].isin(updates.index)
+    for column in METRIC_FIELDS:
+        # Mantém o tipo da coluna (int32 quando o conjunto vem do Parquet)
+        mapped = df["uri"].map(updates[column])
+        df[column] = mapped.where(found, df[column]).astype(df[column].dtype)
+    df["total"] = df[list(METRIC_FIELDS)].sum(axis=1).astype(df["total"].dtype)
+
+    print(f"Métricas atualizadas para {int(found.sum())} de {len(df)} posts.")
+    return df
+
+def refreshDataset(actor, path=None, max_workers=8):
+    """
+    Atualiza as métricas do conjunto salvo de um ator e grava o resultado.
+    """
+    path = path or datasetPath(actor)
+    df = refreshEngagement(loadDataset(path), max_workers=max_workers)
+    if not df.empty:
+        savePosts(df, path)
+    return df
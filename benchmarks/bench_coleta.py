@@ -0,0 +1,59 @@
+# ---------------------------------------------------
+# ⏱️ Benchmark dos coletores contra o servidor XRPC local
+# ---------------------------------------------------
+# Mede a vazão de collectPosts e do rastreamento da rede de seguidores sem
+# acessar a internet, usando api/mock_server.py com latência e 429 simulados.
+#
+# Uso: python benchmarks/bench_coleta.py --pages 50 --latency 0.05 --error-rate 0.1
+import os
+import io
+import sys
+import time
+import argparse
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import nltk
+nltk.data.path.append(os.path.join(ROOT, "nltk_data"))
+
+from api.mock_server import startServer
+from api.client import configure_client
+import api.blueskyApi as bsky
+from sections.network import rastrear_rede
+
+def cronometrar(funcao, *args, **kwargs):
+    inicio = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        resultado = funcao(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--seeds", type=int, default=20)
+    args = parser.parse_args()
+
+    server = startServer(latency=args.latency, error_rate=args.error_rate, retry_after=0,
+                         posts_per_actor=args.pages * 100, profiles_per_actor=200)
+    configure_client(base_url=server.base_url, cache=None, rate_limit=None, backoff_factor=0.01)
+
+    # 📥 Coleta paginada do feed de um ator
+    posts, segundos = cronometrar(bsky.collectPosts, "bench.mock", 100, args.pages, "english")
+    print(f"collectPosts: {len(posts)} posts / {args.pages} páginas em {segundos:.2f}s "
+          f"({len(posts) / segundos:.0f} posts/s)")
+    print(f"  requisições: {server.stats['requests']}, 429 injetados e repetidos: {server.stats['429']}")
+
+    # 🕸️ Rastreamento da rede com diferentes níveis de concorrência
+    sementes = {f"seed{i}.mock" for i in range(args.seeds)}
+    for workers in (1, 8):
+        G, segundos = cronometrar(rastrear_rede, sementes, saltos=1, max_paginas=None, max_workers=workers)
+        print(f"rastrear_rede (max_workers={workers}): {G.number_of_edges()} arestas em {segundos:.2f}s")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# ---------------------------------------------------
+# ⏱️ Benchmark da limpeza de texto: por post, em lote e em paralelo
+# ---------------------------------------------------
+# Compara a antiga cleanText (regex recompilada e stopwords recarregadas a cada
+# post) com cleanTexts em lote e com cleanTextsParallel (pool de processos),
+# usando os textos de output/wsj.csv replicados.
+#
+# Uso: python benchmarks/bench_limpeza.py --scale 10 --workers 4 --chunksize 500
+import os
+import re
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import nltk
+nltk.data.path.append(os.path.join(ROOT, "nltk_data"))
+
+import pandas as pd
+from api.preprocessing import cleanTexts, cleanTextsParallel, getTokenizer
+
+def cleanText_por_post(text, language):
+    # Implementação original, reproduzida aqui apenas para comparação
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\d+', '', text)
+    tokens = getTokenizer('punkt', language)(text)
+    stop_words = set(nltk.corpus.stopwords.words(language if language in nltk.corpus.stopwords.fileids() else 'english'))
+    return [word for word in tokens if word not in stop_words]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=10, help="quantas vezes replicar os textos do wsj.csv")
+    parser.add_argument("--workers", type=int, default=None, help="processos do modo paralelo (padrão: todos os núcleos)")
+    parser.add_argument("--chunksize", type=int, default=500)
+    args = parser.parse_args()
+
+    textos = pd.read_csv(os.path.join(ROOT, "output", "wsj.csv"))["texto_original"].dropna().tolist() * args.scale
+    cleanTexts(textos[:1], "english")  # aquece o cache de recursos
+
+    inicio = time.perf_counter()
+    por_post = [cleanText_por_post(texto, "english") for texto in textos]
+    t_por_post = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    em_lote = cleanTexts(textos, "english")
+    t_lote = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    paralelo = cleanTextsParallel(textos, "english", workers=args.workers, chunksize=args.chunksize)
+    t_paralelo = time.perf_counter() - inicio
+
+    print(f"{len(textos)} textos")
+    print(f"  por post: {t_por_post:.2f}s ({len(textos) / t_por_post:.0f} textos/s)")
+    print(f"  em lote:  {t_lote:.2f}s ({len(textos) / t_lote:.0f} textos/s)")
+    print(f"  paralelo: {t_paralelo:.2f}s ({len(textos) / t_paralelo:.0f} textos/s)")
+    print(f"  ganho do lote: {t_por_post / t_lote:.1f}x | saídas idênticas: {por_post == em_lote}")
+    print(f"  ganho do paralelo sobre o lote: {t_lote / t_paralelo:.1f}x | saídas idênticas: {em_lote == paralelo}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# ---------------------------------------------------
+# ⏱️ Benchmark da análise de sentimentos: serial vs. paralelo
+# ---------------------------------------------------
+# Replica os textos de output/wsj.csv (cada cópia com um sufixo distinto, para
+# que o cache não mascare o custo) e compara o apply original, o serviço em
+# lote serial e o serviço com pool de processos.
+#
+# Uso: python benchmarks/bench_sentimento.py --scale 20 --workers 4 --chunksize 2000
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from utils.sentiment import SentimentService, SCORE_COLUMNS
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=20, help="quantas vezes replicar os textos do wsj.csv")
+    parser.add_argument("--workers", type=int, default=-1, help="processos do modo paralelo (-1 = todos os núcleos)")
+    parser.add_argument("--chunksize", type=int, default=2000)
+    args = parser.parse_args()
+
+    base = pd.read_csv(os.path.join(ROOT, "output", "wsj.csv"))["texto_limpo"].fillna("").tolist()
+    textos = pd.Series([f"{texto} {copia}" for copia in range(args.scale) for texto in base])
+
+    # 🐢 Caminho original: Series.apply com polarity_scores
+    sia = SentimentIntensityAnalyzer()
+    inicio = time.perf_counter()
+    original = pd.DataFrame(textos.apply(sia.polarity_scores).tolist())[SCORE_COLUMNS].to_numpy()
+    t_original = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    serial = SentimentService().score(textos)
+    t_serial = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    paralelo = SentimentService().score(textos, workers=args.workers, chunksize=args.chunksize)
+    t_paralelo = time.perf_counter() - inicio
+
+    print(f"{len(textos)} textos ({os.cpu_count()} núcleos)")
+    print(f"  apply original: {t_original:.2f}s")
+    print(f"  serviço serial: {t_serial:.2f}s")
+    print(f"  paralelo:       {t_paralelo:.2f}s (ganho sobre o original: {t_original / t_paralelo:.1f}x)")
+    print(f"  resultados idênticos: {np.array_equal(original, serial) and np.array_equal(serial, paralelo)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# ---------------------------------------------------
+# ⏱️ Relatório de paridade e velocidade dos tokenizadores
+# ---------------------------------------------------
+# Compara os backends 'punkt' e 'regex' de cleanTexts nos textos de
+# output/wsj.csv: concordância de tokens (por post e no total) e vazão.
+# Exige o modelo punkt (punkt_tab) instalado; sem ele o relatório é abortado.
+#
+# Uso: python benchmarks/bench_tokenizadores.py --scale 10
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import nltk
+nltk.data.path.append(os.path.join(ROOT, "nltk_data"))
+
+import pandas as pd
+from api.preprocessing import cleanTexts, TOKENIZERS
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=10, help="quantas vezes replicar os textos do wsj.csv")
+    parser.add_argument("--language", default="english")
+    args = parser.parse_args()
+
+    textos = pd.read_csv(os.path.join(ROOT, "output", "wsj.csv"))["texto_original"].dropna().tolist()
+
+    # Sem o punkt instalado o backend cai para separação por espaço e a
+    # comparação não mediria nada: encerra em vez de imprimir números sem sentido
+    try:
+        nltk.word_tokenize("teste", language=args.language)
+    except LookupError:
+        sys.exit(f"Modelo punkt (punkt_tab) indisponível para '{args.language}': "
+                 "instale-o com nltk.download('punkt_tab') para comparar os tokenizadores.")
+
+    resultados = {}
+    for nome in TOKENIZERS:
+        cleanTexts(textos[:1], args.language, nome)  # carrega recursos fora da medição
+        lote = textos * args.scale
+        inicio = time.perf_counter()
+        cleanTexts(lote, args.language, nome)
+        segundos = time.perf_counter() - inicio
+        resultados[nome] = (cleanTexts(textos, args.language, nome), segundos, len(lote))
+
+    # 🔍 Concordância: posts idênticos e tokens em comum (multiconjunto)
+    punkt, regex = resultados["punkt"][0], resultados["regex"][0]
+    iguais = sum(a == b for a, b in zip(punkt, regex))
+    comuns = sum(sum((Counter(a) & Counter(b)).values()) for a, b in zip(punkt, regex))
+    total = sum(max(len(a), len(b)) for a, b in zip(punkt, regex))
+
+    print(f"{len(textos)} posts do wsj.csv")
+    print(f"  posts com tokens idênticos: {iguais} ({iguais / len(textos):.2%})")
+    print(f"  concordância de tokens: {comuns / max(total, 1):.2%}")
+    for nome, (_, segundos, n) in resultados.items():
+        print(f"  {nome:>6}: {segundos:.2f}s para {n} textos ({n / segundos:.0f} textos/s)")
+    print(f"  ganho do regex: {resultados['punkt'][1] / resultados['regex'][1]:.1f}x")
+
+    divergentes = [(a, b) for a, b in zip(punkt, regex) if a != b][:5]
+    for a, b in divergentes:
+        print(f"  diferença: punkt={sorted(set(a) - set(b))} regex={sorted(set(b) - set(a))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# ---------------------------------------------------
+# ⏱️ Benchmark do ranking de tokens por engajamento
+# ---------------------------------------------------
+# Compara o laço original com iterrows ao get_top_tokens vetorizado (explode +
+# groupby e, com a TokenMatrix, bincount sobre os ids) em output/wsj.csv
+# replicado --scale vezes.
+#
+# Uso: python benchmarks/bench_top_tokens.py --scale 100
+import io
+import os
+import sys
+import time
+import argparse
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+with redirect_stdout(io.StringIO()):
+    from api.storage import loadPosts
+    from utils.patterns import get_top_tokens
+    from utils.vocabulary import TokenMatrix
+
+def iterrows_top_tokens(df, top_n=10):
+    # Implementação original, mantida aqui só como referência de tempo
+    token_engagement = {}
+    for _, row in df.iterrows():
+        for token in row['tokens']:
+            token_engagement[token] = token_engagement.get(token, 0) + row['total']
+    return pd.DataFrame(list(token_engagement.items()), columns=['Token', 'Engajamento']) \
+             .sort_values(by='Engajamento', ascending=False).head(top_n)
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=100, help="quantas vezes replicar os posts do wsj.csv")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    base = loadPosts(os.path.join(ROOT, "output", "wsj.csv"), columns=["tokens", "total"])
+    df = pd.concat([base] * args.scale, ignore_index=True)
+    print(f"{len(df)} posts, {df['tokens'].map(len).sum()} tokens")
+
+    original, t_original = medir(lambda: iterrows_top_tokens(df, args.top))
+    explode, t_explode = medir(lambda: get_top_tokens(df, args.top))
+    matriz, t_matriz = medir(lambda: TokenMatrix.from_tokens(df['tokens']))
+    ids, t_ids = medir(lambda: get_top_tokens(df, args.top, token_matrix=matriz))
+
+    print(f"  iterrows (original):       {t_original:7.3f}s")
+    print(f"  explode + groupby:         {t_explode:7.3f}s ({t_original / t_explode:.0f}x)")
+    print(f"  TokenMatrix (já montada):  {t_ids:7.3f}s ({t_original / t_ids:.0f}x; montagem {t_matriz:.3f}s)")
+    mesmos = (original['Engajamento'].tolist() == explode['Engajamento'].tolist() == ids['Engajamento'].tolist())
+    print(f"  mesmo ranking de engajamento: {mesmos}")
+
+if __name__ == "__main__":
+    main()
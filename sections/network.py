@@ -2,10 +2,10 @@
 # 📦 Importações de Bibliotecas Necessárias
 # ---------------------------------------------------
 import api.blueskyApi as blueskyApi  # Módulo personalizado para chamadas à API do Bluesky
-import re
+from sections.topic import buscar_temas
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import pandas as pd
 import streamlit as st
 import seaborn as sns
@@ -19,81 +19,6 @@ import networkx as nx
 nltk.download('stopwords')
 nltk.download('punkt')
 
-# ---------------------------------------------------
-# 🧹 Função para Limpeza e Tokenização de Texto
-# ---------------------------------------------------
-def cleanText(text, language):
-    text = text.lower()  # Converte tudo para minúsculas
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)  # Remove URLs
-    text = re.sub(r'[^\w\s]', '', text)  # Remove pontuação
-    text = re.sub(r'\d+', '', text)  # Remove números
-    
-    tokens = word_tokenize(text, language=language)  # Tokeniza o texto com base no idioma
-    
-    stop_words = set(stopwords.words(language if language == 'portuguese' else 'english'))  # Define as stopwords
-    tokens_sem_stopwords = [word for word in tokens if word not in stop_words]  # Remove stopwords
-    return tokens_sem_stopwords
-
-# ---------------------------------------------------
-# 📥 Coleta de Posts via API do Bluesky
-# ---------------------------------------------------
-def collectPosts(actor, limit, iterations, language):
-    all_posts = []
-    cursor = None
-
-    for i in range(iterations):
-        st.write(f"Coletando lote {i + 1} de posts...")
-        result = blueskyApi.getUserFeedPlus(actor, limit=limit, cursor=cursor)
-        if not result:
-            break
-
-        posts = result.get('feed', [])
-        cursor = result.get('cursor', None)
-
-        for post in posts:
-            # Coleta estatísticas de engajamento
-            replyCount = post.get('post', {}).get('replyCount', 0)
-            repostCount = post.get('post', {}).get('repostCount', 0)
-            likeCount = post.get('post', {}).get('likeCount', 0)
-            quoteCount = post.get('post', {}).get('quoteCount', 0)
-            timestamp = post.get('post', {}).get('indexedAt')
-            total = replyCount + repostCount + likeCount + quoteCount
-
-            # Extrai texto e metadados
-            record = post.get('post', {}).get('record', {})
-            text = record.get('text')
-            author = post.get('post', {}).get('author', {})
-            embed = record.get('embed', {}).get('images', [])
-            image_ref = embed[0].get('image', {}).get('ref', {}).get('$link') if embed else None
-
-            if text:
-                original_text = text
-                tokens = cleanText(text, language)
-                clean = ' '.join(tokens)
-
-                postData = {
-                    'texto_original': original_text,
-                    'texto_limpo': clean,
-                    'tokens': tokens,
-                    'comentarios': replyCount,
-                    'likes': likeCount,
-                    'compartilhamentos': repostCount,
-                    'repostagens': quoteCount,
-                    'total': total,
-                    'data_hora': timestamp,
-                    'author_handle': author.get('handle', ''),
-                    'author_displayName': author.get('displayName', ''),
-                    'image_ref': image_ref
-                }
-                all_posts.append(postData)
-
-        if not cursor:
-            st.write("Fim dos dados disponíveis.")
-            break
-
-    st.write(f"Total de posts coletados: {len(all_posts)}")
-    return all_posts
-
 # ---------------------------------------------------
 # 📊 Visualização de Distribuições
 # ---------------------------------------------------
@@ -145,31 +70,49 @@ def remove_repetidos(vetor):
     return list(set(vetor))
 
 # ---------------------------------------------------
-# 📡 Coleta de Seguidores e Seguidos de Autores
-# ---------------------------------------------------
-def coletar_seguidores_e_seguidos(autores):
-    seguidores_por_autor = {}
-    seguidos_por_autor = {}
-
-    for autor in autores:
-        seguidores_por_autor[autor] = blueskyApi.getUserFollowers(autor, 100)
-        seguidos_por_autor[autor] = blueskyApi.getUserFollows(autor, 100)
-
-    return seguidores_por_autor, seguidos_por_autor
-
-# ---------------------------------------------------
-# 🌐 Construção do Grafo de Rede
-# ---------------------------------------------------
-def construir_rede(seguidores_por_autor, seguidos_por_autor):
-    G = nx.DiGraph()  # Grafo direcionado
-
-    for autor, seguidores in seguidores_por_autor.items():
-        for seguidor in seguidores:
-            G.add_edge(seguidor, autor)
-
-    for autor, seguidos in seguidos_por_autor.items():
-        for seguido in seguidos:
-            G.add_edge(autor, seguido)
+# 🕸️ Rastreamento da Rede em Largura (Multi-Saltos)
+# ---------------------------------------------------
+def rastrear_rede(sementes, saltos=1, max_paginas=None, max_workers=8, max_nos=None, G=None):
+    """
+    Constrói o grafo de seguidores a partir dos autores-semente, seguindo os
+    cursores da API e expandindo em largura por até `saltos` níveis.
+    As arestas entram no grafo conforme cada página chega, sem guardar as
+    respostas brutas; um conjunto de visitados evita recoletar o mesmo perfil.
+    max_nos limita o número de perfis expandidos no total.
+    """
+    G = G if G is not None else nx.DiGraph()
+    lock = threading.Lock()
+    visitados = set()
+    fronteira = set(sementes)
+
+    def expandir(autor, coletar_vizinhos):
+        vizinhos = set()
+        for seguidores in blueskyApi.iterUserFollowers(autor, 100, max_paginas):
+            with lock:
+                G.add_edges_from((seguidor, autor) for seguidor in seguidores)
+            if coletar_vizinhos:
+                vizinhos.update(seguidores)
+        for seguidos in blueskyApi.iterUserFollows(autor, 100, max_paginas):
+            with lock:
+                G.add_edges_from((autor, seguido) for seguido in seguidos)
+            if coletar_vizinhos:
+                vizinhos.update(seguidos)
+        return vizinhos
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for nivel in range(saltos):
+            fronteira -= visitados
+            if max_nos is not None:
+                fronteira = set(list(fronteira)[:max(max_nos - len(visitados), 0)])
+            if not fronteira:
+                break
+
+            visitados |= fronteira
+            ultimo_nivel = nivel == saltos - 1
+            proxima = set()
+            for vizinhos in executor.map(lambda autor: expandir(autor, not ultimo_nivel), fronteira):
+                proxima |= vizinhos
+            fronteira = proxima
 
     return G
 
@@ -184,6 +127,8 @@ def analisar_rede(G):
 # ---------------------------------------------------
 # 🧩 Visualização da Rede com NetworkX e Streamlit
 # ---------------------------------------------------
+LIMITE_VISUALIZACAO = 1000  # acima disso o spring_layout fica lento e ilegível
+
 def visualizar_rede(G, degree_centrality, communities):
     pos = nx.spring_layout(G)
     plt.figure(figsize=(12, 8))
@@ -210,42 +155,33 @@ def networkPage():
     temas = st.text_input("Digite os temas separados por vírgula (ex: Cruzeiro, Gabigol):")
     temas = [tema.strip() for tema in temas.split(",")] if temas else ["Cruzeiro", "Gabigol"]
     limit = st.number_input("Número máximo de posts para buscar por tema:", min_value=1, value=5)
+    max_workers = st.number_input("Requisições simultâneas:", min_value=1, max_value=20, value=8)
+    saltos = st.number_input("Saltos a partir dos autores (1 = apenas vizinhos diretos):", min_value=1, max_value=3, value=1)
+    max_paginas = st.number_input("Páginas de 100 seguidores/seguidos por perfil:", min_value=1, value=1)
 
     if st.button("Analisar Rede"):
         st.write("Coletando dados...")
 
-        textos_gerais = []
-        autores_gerais = []
-
-        for tema in temas:
-            result = blueskyApi.search_posts(tema, limit)
-            if result:
-                st.write(f"Posts encontrados para o tema '{tema}':")
-                textos = []
-                usuarios = []
+        df_temas = buscar_temas(temas, limit, 'english', max_workers=max_workers)
+        if df_temas.empty:
+            st.error("Nenhum post encontrado para os temas informados.")
+            return
+        st.write(f"Posts encontrados para os temas: {len(df_temas)}")
+        textos_gerais = df_temas['texto_original'].tolist()
+        autores_gerais = [autor for autor in df_temas['author_handle'] if autor]
 
-                for post in result.get("posts", []):
-                    record = post.get("record")
-                    author = post.get("author")
-
-                    if record and author:
-                        textos.append(record.get("text"))
-                        usuarios.append(author.get("handle"))
-
-                textos_gerais.extend(textos)
-                autores_gerais.extend(usuarios)
-
-        st.write("Coletando seguidores e seguidos...")
-        seguidores_por_autor, seguidos_por_autor = coletar_seguidores_e_seguidos(set(autores_gerais))
-
-        st.write("Construindo a rede...")
-        G = construir_rede(seguidores_por_autor, seguidos_por_autor)
+        st.write("Coletando seguidores e seguidos e construindo a rede...")
+        G = rastrear_rede(set(autores_gerais), saltos=saltos, max_paginas=max_paginas, max_workers=max_workers)
+        st.write(f"Rede com {G.number_of_nodes()} perfis e {G.number_of_edges()} conexões.")
 
         st.write("Analisando a rede...")
         degree_centrality, communities = analisar_rede(G)
 
-        st.write("Visualizando a rede...")
-        visualizar_rede(G, degree_centrality, communities)
+        if G.number_of_nodes() <= LIMITE_VISUALIZACAO:
+            st.write("Visualizando a rede...")
+            visualizar_rede(G, degree_centrality, communities)
+        else:
+            st.warning(f"Rede grande demais para desenhar (mais de {LIMITE_VISUALIZACAO} perfis).")
 
         st.subheader("Centralidade de Grau")
         st.write(pd.DataFrame.from_dict(degree_centrality, orient="index", columns=["Centralidade"]).sort_values(by="Centralidade", ascending=False))
@@ -256,16 +192,10 @@ def networkPage():
 
         # Salvar os dados em arquivos CSV
         st.write("Exportando dados...")
-        df_posts = pd.DataFrame({"Texto": textos_gerais, "Usuario": autores_gerais})
+        df_posts = pd.DataFrame({"Texto": textos_gerais, "Usuario": df_temas['author_handle'], "Tema": df_temas['tema']})
         df_posts.to_csv("posts.csv", index=False)
 
-        data_seguidores = {"Usuario": [], "Seguidores": [], "Seguidos": []}
-        for autor in seguidores_por_autor:
-            data_seguidores["Usuario"].append(autor)
-            data_seguidores["Seguidores"].append(", ".join(seguidores_por_autor[autor]))
-            data_seguidores["Seguidos"].append(", ".join(seguidos_por_autor[autor]))
-
-        df_relacoes = pd.DataFrame(data_seguidores)
+        df_relacoes = nx.to_pandas_edgelist(G, source="Seguidor", target="Seguido")
         df_relacoes.to_csv("relacoes_seguidores.csv", index=False)
 
         st.success("Análise concluída!")
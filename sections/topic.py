@@ -3,71 +3,84 @@
 # ---------------------------------------------------
 import streamlit as st
 import pandas as pd
-from api.blueskyApi import search_posts, cleanText  # Funções da API personalizada para busca e limpeza de texto
+from concurrent.futures import ThreadPoolExecutor
+from api.blueskyApi import iterSearchPosts, cleanPosts  # Funções da API personalizada para busca e limpeza de texto
 from utils.graph_utils import distribution_values, analyze_correlation, generate_wordcloud  # Utilitários de visualização
-from utils.mining import analyzeSentiment, topicModeling  # Funções de mineração de texto
+from utils.mining import analyzeSentiment, topicModeling, topicSweep  # Funções de mineração de texto
+from utils.vocabulary import TokenMatrix  # Vocabulário compartilhado com tokens codificados como inteiros
+from utils.features import build_feature_frame  # Conjunto de posts tipado com colunas derivadas
+from utils.topic_store import MIN_COHERENCE_SAMPLE  # Menor amostra usada na coerência
+import utils.patterns as patterns
 
 # ---------------------------------------------------
-# 🔝 Função Auxiliar: Tokens com Maior Engajamento
+# 🧾 Função para Processar um Post da Busca
 # ---------------------------------------------------
-def get_top_tokens(df):
-    token_engagement = {}
-    for _, row in df.iterrows():
-        for token in row['tokens']:
-            if token not in token_engagement:
-                token_engagement[token] = 0
-            token_engagement[token] += row['total']  # Soma o engajamento total por token
-
-    # Retorna os 10 tokens mais engajados como DataFrame
-    return pd.DataFrame(
-        list(token_engagement.items()), 
-        columns=['Token', 'Engajamento']
-    ).sort_values(by='Engajamento', ascending=False).head(10)
+def processar_post(post):
+    # Coleta de métricas de engajamento
+    replyCount = post.get('replyCount', 0)
+    repostCount = post.get('repostCount', 0)
+    likeCount = post.get('likeCount', 0)
+    quoteCount = post.get('quoteCount', 0)
+    total = replyCount + repostCount + likeCount + quoteCount
+
+    # Coleta de metadados e texto
+    record = post.get('record', {})
+    text = record.get('text', '')
+    author = post.get('author', {})
+    timestamp = post.get('indexedAt', '')
+    langs = record.get('langs') or []
+
+    # Limpeza e tokenização são feitas em lote depois (cleanPosts)
+    return {
+        'texto_original': text,
+        'texto_limpo': '',
+        'tokens': [],
+        'comentarios': replyCount,
+        'likes': likeCount,
+        'compartilhamentos': repostCount,
+        'repostagens': quoteCount,
+        'total': total,
+        'data_hora': timestamp,
+        'author_handle': author.get('handle', ''),
+        'author_displayName': author.get('displayName', ''),
+        'uri': post.get('uri', ''),
+        'idioma': langs[0] if langs else ''
+    }
 
 # ---------------------------------------------------
-# 🔍 Função para Buscar e Processar Posts de um Tema
+# 🔍 Função para Buscar e Processar Posts de Vários Temas
 # ---------------------------------------------------
-def buscar_e_processar_posts(tema, limit, language_code):
+def buscar_temas(temas, limit, language_code, max_workers=4):
+    """
+    Busca até `limit` posts por tema, seguindo o cursor da API, com os temas
+    executados em paralelo. Posts encontrados por mais de um tema aparecem uma
+    única vez (pela URI), com a coluna 'tema' listando todos os temas que o
+    encontraram.
+    """
+    def coletar(tema):
+        return [post for pagina in iterSearchPosts(tema, limit) for post in pagina]
+
+    posts_por_uri = {}
+    temas_por_uri = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for tema, posts in zip(temas, executor.map(coletar, temas)):
+            for post in posts:
+                uri = post.get('uri') or id(post)
+                if uri not in posts_por_uri:
+                    posts_por_uri[uri] = processar_post(post)
+                    temas_por_uri[uri] = []
+                if tema not in temas_por_uri[uri]:
+                    temas_por_uri[uri].append(tema)
+
     all_posts = []
-    
-    result = search_posts(tema, limit)
-    if result:
-        posts = result.get('posts', [])
-        
-        for post in posts:
-            # Coleta de métricas de engajamento
-            replyCount = post.get('replyCount', 0)
-            repostCount = post.get('repostCount', 0)
-            likeCount = post.get('likeCount', 0)
-            quoteCount = post.get('quoteCount', 0)
-            total = replyCount + repostCount + likeCount + quoteCount
-
-            # Coleta de metadados e texto
-            record = post.get('record', {})
-            text = record.get('text', '')
-            author = post.get('author', {})
-            timestamp = post.get('indexedAt', '')
-
-            # Limpeza e tokenização do texto
-            tokens = cleanText(text, language_code)
-            clean_text = ' '.join(tokens)
-
-            post_data = {
-                'texto_original': text,
-                'texto_limpo': clean_text,
-                'tokens': tokens,
-                'comentarios': replyCount,
-                'likes': likeCount,
-                'compartilhamentos': repostCount,
-                'repostagens': quoteCount,
-                'total': total,
-                'data_hora': timestamp,
-                'author_handle': author.get('handle', ''),
-                'author_displayName': author.get('displayName', '')
-            }
-            all_posts.append(post_data)
-    
-    return pd.DataFrame(all_posts)
+    for uri, post_data in posts_por_uri.items():
+        post_data['tema'] = ', '.join(temas_por_uri[uri])
+        all_posts.append(post_data)
+
+    return pd.DataFrame(cleanPosts(all_posts, language_code))
+
+def buscar_e_processar_posts(tema, limit, language_code):
+    return buscar_temas([tema], limit, language_code)
 
 # ---------------------------------------------------
 # 📊 Página de Análise por Tema (Interface Streamlit)
@@ -76,21 +89,33 @@ def topicPage():
     st.title("Analisar Posts Sobre um Tema")
 
     # 🌐 Escolha do idioma (para limpeza de texto)
-    language = st.radio("Escolha o idioma:", ('Português', 'Inglês'), key="topic_lang")
+    language = st.radio("Escolha o idioma (usado nos posts sem idioma declarado):", ('Português', 'Inglês'), key="topic_lang")
     language_code = 'portuguese' if language == 'Português' else 'english'
 
-    # 🎯 Entrada de tema e número de posts
-    tema = st.text_input("Digite o tema para buscar os posts:", "Cruzeiro")
-    limit = st.number_input("Número máximo de posts:", min_value=1, value=15, step=5)
+    # 🎯 Entrada de temas e número de posts
+    tema = st.text_input("Digite o tema para buscar os posts (vários separados por vírgula):", "Cruzeiro")
+    limit = st.number_input("Número máximo de posts por tema:", min_value=1, value=15, step=5)
+    varredura = st.checkbox("Escolher o número de tópicos pela coerência (testa de 2 a 10 em paralelo)", key="topic_sweep")
+    num_topicos = None if varredura else st.number_input("Número de tópicos:", min_value=1, max_value=20, value=3, key="topic_count")
+
+    coerencia = st.radio("Medida de coerência dos tópicos:", ('c_v', 'u_mass', 'Nenhuma'), key="topic_coherence_radio", horizontal=True,
+                         help="'u_mass' usa só as contagens do corpus e é bem mais rápida que 'c_v'.")
+    amostra_coerencia = st.number_input("Posts usados na coerência (0 = todos):", min_value=0, value=0, step=500, key="topic_coherence_sample",
+                                        help=f"Amostras menores que {MIN_COHERENCE_SAMPLE} posts são ampliadas para esse valor. "
+                                             "Valores de amostras não são comparáveis aos calculados com todos os posts.")
 
     # ▶️ Botão de execução da análise
     if st.button("Analisar Tema"):
-        if tema:
+        temas = [t.strip() for t in tema.split(",") if t.strip()]
+        if temas:
             st.write("Coletando dados...")
-            df = buscar_e_processar_posts(tema, limit, language_code)
+            df = buscar_temas(temas, limit, language_code)
+            if not df.empty:
+                df = build_feature_frame(df)  # Datas, contadores e autores tipados uma única vez
 
             if not df.empty:
                 st.write(f"Total de posts coletados: {len(df)}")
+                matriz = TokenMatrix.from_tokens(df['tokens'])
 
                 # 💾 Botão para baixar os dados como CSV
                 csv = df.to_csv(index=False)
@@ -98,11 +123,10 @@ def topicPage():
 
                 # ☁️ WordCloud
                 st.write("### WordCloud das Palavras Mais Frequentes")
-                generate_wordcloud(df['tokens'])
+                generate_wordcloud(df['tokens'], token_matrix=matriz)
 
                 # 🕒 Evolução temporal do engajamento
                 st.write("### Evolução Temporal de Engajamento")
-                df['data_hora'] = pd.to_datetime(df['data_hora'])  # Conversão para datetime
                 temporal_data = df.groupby(df['data_hora'].dt.date)['total'].sum()
                 st.line_chart(temporal_data)
 
@@ -116,7 +140,7 @@ def topicPage():
 
                 # 🔝 Tokens com maior engajamento
                 st.write("### Tokens com Mais Engajamento")
-                top_tokens = get_top_tokens(df)
+                top_tokens = patterns.get_top_tokens(df, token_matrix=matriz)
                 st.dataframe(top_tokens)
 
                 # 💬 Análise de sentimentos (negativo, neutro, positivo)
@@ -126,9 +150,15 @@ def topicPage():
 
                 # 🧠 Modelagem de Tópicos com LDA
                 st.write("### Modelagem de Tópicos")
-                topics = topicModeling(df, num_topics=3, passes=10)
-                for topic in topics:
-                    st.write(f"Tópico {topic[0]+1}: {topic[1]}")
+                medida = None if coerencia == 'Nenhuma' else coerencia
+                if varredura:
+                    topicSweep(df, topic_counts=range(2, 11), passes=10, token_matrix=matriz,
+                               coherence=medida, coherence_sample=amostra_coerencia or None)
+                else:
+                    # A modelagem é a última seção da página: a coerência é calculada logo após
+                    # tópicos e WordClouds serem exibidos, sem adiar para segundo plano
+                    topicModeling(df, num_topics=num_topicos, passes=10, token_matrix=matriz, coherence=medida,
+                                  coherence_sample=amostra_coerencia or None)
 
             else:
                 st.error("Nenhum post encontrado para este tema.")
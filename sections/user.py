@@ -6,11 +6,16 @@ import pandas as pd
 
 # 🧩 Módulos personalizados para análise de dados
 import api as bsky                     # API personalizada para coleta e limpeza de dados do Bluesky
+import api.sync as sync               # Sincronização incremental dos posts salvos
+import api.storage as storage         # Armazenamento colunar (Parquet) dos posts
 import utils.mining as mining         # Mineração de texto: sentimentos, tópicos, etc.
 import utils.arima_model as arima     # Modelagem preditiva com ARIMA
 import utils.graph_utils as graph     # Gráficos e visualizações
 import utils.patterns as patterns     # Análise de padrões em posts
 import utils.map as maps              # Geração de mapas interativos
+import utils.features as features    # Conjunto de posts tipado com colunas derivadas
+import utils.topic_store as topic_store  # Modelos de tópicos e coerência
+from utils.vocabulary import TokenMatrix  # Vocabulário compartilhado com tokens codificados como inteiros
 
 # ---------------------------------------------------
 # 🧑‍💻 Função Principal da Página de Análise por Usuário
@@ -22,32 +27,85 @@ def usersPage():
     actor = st.text_input("Digite o @ do usuário:", value="nytimes.com", key="actor_input")
     limit = st.number_input("Quantidade de posts por iteração:", min_value=1, max_value=100, value=100, key="limit_input")
     iterations = st.number_input("Número de iterações:", min_value=1, value=100, key="iterations_input")
+    incremental = st.checkbox("Sincronização incremental (busca só os posts novos desde a última análise)", key="sync_checkbox")
+    atualizar_metricas = incremental and st.checkbox("Atualizar o engajamento dos posts já salvos", key="refresh_checkbox")
+    # A sincronização incremental pagina até o último post salvo: limites de coleta e blocos paralelos não se aplicam
+    max_posts = st.number_input("Limite total de posts (0 = sem limite):", min_value=0, value=0, key="max_posts_input",
+                                disabled=incremental)
+    max_seconds = st.number_input("Tempo máximo de coleta em segundos (0 = sem limite):", min_value=0, value=0, key="max_seconds_input",
+                                  disabled=incremental)
+    workers = st.number_input("Processos para tokenização, sentimentos e LDA em paralelo (0 = sem paralelismo):", min_value=0, value=0, key="workers_input",
+                              help="Na sincronização incremental, a tokenização dos posts novos não usa processos.")
+    chunksize = st.number_input("Posts por tarefa de tokenização paralela (0 = uma página por tarefa):",
+                                min_value=0, value=0, step=100, key="chunksize_input", disabled=incremental)
+    tokenizer = st.radio("Tokenizador:", ('punkt', 'regex'), key="tokenizer_radio",
+                         help="'regex' é mais rápido e não carrega os modelos punkt do NLTK.")
     forecast_days = st.radio("Quantidade de dias para previsão de engajamento:", (3, 7, 30), key="days_radio")
     
-    language = st.radio("Escolha o idioma:", ('Português', 'Inglês'), key="language_radio")
+    language = st.radio("Escolha o idioma (usado nos posts sem idioma declarado):", ('Português', 'Inglês'), key="language_radio")
     language_code = 'portuguese' if language == 'Português' else 'english'
+    varredura = st.checkbox("Escolher o número de tópicos pela coerência (testa de 2 a 10 em paralelo)", key="user_topic_sweep")
+    num_topicos = None if varredura else st.number_input("Número de tópicos:", min_value=1, max_value=20, value=5, key="user_topic_count")
+    coerencia = st.radio("Medida de coerência dos tópicos:", ('c_v', 'u_mass', 'Nenhuma'), key="user_coherence_radio", horizontal=True,
+                         help="'u_mass' usa só as contagens do corpus e é bem mais rápida que 'c_v'.")
+    amostra_coerencia = st.number_input("Posts usados na coerência (0 = todos):", min_value=0, value=0, step=500, key="user_coherence_sample",
+                                        help=f"Amostras menores que {topic_store.MIN_COHERENCE_SAMPLE} posts são ampliadas para esse valor. "
+                                             "Valores de amostras não são comparáveis aos calculados com todos os posts.")
+    retreinar_topicos = not varredura and st.checkbox("Retreinar o modelo de tópicos do zero", key="retrain_checkbox",
+                                    help="Por padrão o modelo salvo para o usuário só é atualizado com os posts novos.")
 
     # ▶️ Botão para iniciar análise
     if st.button("Analisar", key="analyze_button"):
         if actor:
+            mining.clearPendingCoherence()  # Coerências de execuções anteriores não têm mais onde aparecer
             bsky.nltkDownload()  # Garante que os dados do NLTK estão configurados corretamente
             st.write("Coletando dados...")
 
-            # 📥 Coleta os posts do usuário
-            posts = bsky.collectPosts(actor, limit, iterations, language_code)
-
-            if posts:
-                st.write(f"Total de posts coletados: {len(posts)}")
-                df = pd.DataFrame(posts)
+            lotes = []
+            if incremental:
+                # 🔄 Busca apenas os posts novos e junta ao conjunto salvo
+                df_sync, novos = sync.syncPosts(actor, language_code, limit=limit, max_iterations=iterations,
+                                                tokenizer=tokenizer)
+                st.write(f"Posts novos desde a última sincronização: {novos}")
+                if atualizar_metricas:
+                    st.write("Atualizando métricas de engajamento...")
+                    df_sync = sync.refreshDataset(actor)
+                if not df_sync.empty:
+                    lotes.append(df_sync)
+            else:
+                # 📥 Coleta os posts do usuário lote a lote, exibindo o progresso
+                progresso = st.empty()
+                previa = st.empty()
+                total_coletado = 0
+                for lote in bsky.iterPosts(actor, limit, iterations, language_code,
+                                           max_posts=max_posts or None, max_seconds=max_seconds or None,
+                                           workers=workers or None, tokenizer=tokenizer,
+                                           chunksize=chunksize or None):
+                    lote_df = pd.DataFrame(lote)
+                    lotes.append(lote_df)
+                    total_coletado += len(lote_df)
+                    progresso.write(f"Posts coletados até agora: {total_coletado}")
+                    previa.dataframe(lote_df[['data_hora', 'texto_original', 'total']])
+                previa.empty()
+
+            if lotes:
+                # 🧱 Conjunto tipado (datas, contadores, autor e colunas derivadas) usado por todas as análises
+                df = features.build_feature_frame(pd.concat(lotes, ignore_index=True))
+                st.write(f"Total de posts coletados: {len(df)}")
+
+                # 🔢 Codifica os tokens uma única vez para todas as análises
+                matriz = TokenMatrix.from_tokens(df['tokens'])
 
                 # 💾 Permite download dos dados coletados
                 st.write("### Baixar Dados como CSV")
                 csv = df.to_csv(index=False)
                 st.download_button(label="Baixar CSV", data=csv, file_name="dados_posts.csv", mime="text/csv")
+                st.download_button(label="Baixar Parquet", data=storage.toParquetBytes(df),
+                                   file_name="dados_posts.parquet", mime="application/octet-stream")
 
                 # ☁️ Geração de WordCloud
                 st.write("### WordCloud das Palavras Mais Frequentes")
-                graph.generate_wordcloud(df['tokens'])
+                graph.generate_wordcloud(df['tokens'], token_matrix=matriz)
 
                 # 📊 Distribuição das métricas de engajamento
                 st.write("### Distribuição dos Valores")
@@ -73,10 +131,9 @@ def usersPage():
                                 st.image(image_url, caption="Imagem do Post", use_column_width=True)
 
                 # 🔍 Análise de padrões nos posts (ex: tamanho do texto, horários, etc.)
-                patterns.analyze_post_features(df)
+                patterns.analyze_post_features(df, token_matrix=matriz)
 
                 # 📈 Pré-processa para análise temporal
-                df['data_hora'] = pd.to_datetime(df['data_hora'])
                 temporal_data = df.groupby(df['data_hora'].dt.date)['total'].sum()
                 # st.line_chart(temporal_data)  # Você pode ativar isso se quiser mostrar a linha do tempo
 
@@ -88,11 +145,21 @@ def usersPage():
                 melhor_hora, melhor_dia, melhor_tamanho = arima.analyze_best_post(df)
 
                 # 💬 Análise de sentimentos, modelagem de tópicos e geolocalização
-                mining.analyzeSentiment(df)
-                mining.topicModeling(df)
+                mining.analyzeSentiment(df, workers=workers or None)
+                medida = None if coerencia == 'Nenhuma' else coerencia
+                if varredura:
+                    mining.topicSweep(df, topic_counts=range(2, 11), token_matrix=matriz, workers=workers or None,
+                                      coherence=medida, coherence_sample=amostra_coerencia or None)
+                else:
+                    mining.topicModeling(df, num_topics=num_topicos, token_matrix=matriz, model_name=actor,
+                                         retrain=retreinar_topicos, workers=workers or None, coherence=medida,
+                                         coherence_sample=amostra_coerencia or None, defer_coherence=True)
                 mining.analyze_sentiment_by_state(df)
                 maps.create_sentiment_map(df)
 
+                # 📐 Coerência dos tópicos calculada em segundo plano
+                mining.showPendingCoherence()
+
             else:
                 st.error("Nenhum dado encontrado para o usuário informado.")
         else:
@@ -7,6 +7,7 @@ from statsmodels.tsa.arima.model import ARIMA  # Modelo ARIMA para séries tempo
 import numpy as np
 import wordcloud as WordCloud
 import matplotlib as plt      
+from utils.features import ensure_features  # Conjunto tipado com data, hora e tamanho já calculados
 
 # ---------------------------------------------------
 # 📈 Previsão com ARIMA: Engajamento Futuro
@@ -16,9 +17,8 @@ def train_arima(df, forecast_days):
     Realiza a previsão do engajamento dos posts para os próximos dias utilizando ARIMA.
     """
 
-    # 🕒 Converte a coluna 'data_hora' para datetime e ordena os dados por data
-    df['data_hora'] = pd.to_datetime(df['data_hora'])
-    df = df.sort_values('data_hora')
+    # 🕒 Ordena os dados por data ('data_hora' já vem como datetime do conjunto tipado)
+    df = ensure_features(df).dropna(subset=['data_hora']).sort_values('data_hora')
 
     # 📊 Agrega os dados de engajamento por dia
     df_daily = df.set_index('data_hora').resample('D')['total'].sum().fillna(0)
@@ -76,10 +76,8 @@ def analyze_best_post(df):
     - número de caracteres
     """
 
-    # 🔍 Extração de variáveis úteis para análise
-    df['num_caracteres'] = df['texto_original'].apply(len)
-    df['hora'] = pd.to_datetime(df['data_hora']).dt.hour
-    df['dia_semana'] = pd.to_datetime(df['data_hora']).dt.dayofweek
+    # 🔍 Hora, dia da semana e número de caracteres já vêm do conjunto tipado
+    df = ensure_features(df)
 
     # 🕒 Melhor hora com base na média de engajamento
     eng_por_hora = df.groupby('hora')['total'].mean().reset_index()
@@ -0,0 +1,131 @@
+# ---------------------------------------------------
+# 📦 Importações de Bibliotecas
+# ---------------------------------------------------
+import os
+import re
+import hashlib
+
+import numpy as np
+from gensim import corpora, matutils
+
+# ---------------------------------------------------
+# ⚙️ Configurações
+# ---------------------------------------------------
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "corpus")
+MAX_BYTES = 500 * 1024 * 1024  # 500 MB; acima disso os corpus usados há mais tempo são removidos
+CACHE_SUFFIXES = ('.dict', '.mm', '.mm.index')  # arquivos de cada conjunto em cache
+
+# Poda do vocabulário (Dictionary.filter_extremes): palavras em menos de NO_BELOW
+# posts ou em mais de NO_ABOVE (fração) dos posts saem; no máximo KEEP_N palavras
+NO_BELOW = 2
+NO_ABOVE = 0.5
+KEEP_N = 100_000
+MIN_DOCS_TO_PRUNE = 20  # coleções menores (ex: poucos posts por tema) usam o vocabulário inteiro
+
+# ---------------------------------------------------
+# 🔑 Identificação do Conjunto de Dados
+# ---------------------------------------------------
+def dataset_hash(texts, token_matrix=None):
+    """
+    Hash do conteúdo tokenizado: o mesmo conjunto de posts gera sempre a mesma chave.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if token_matrix is not None:
+        # Arrays já codificados: hash direto dos bytes, sem percorrer as strings
+        digest.update("\x1f".join(token_matrix.vocab).encode('utf-8'))
+        digest.update(np.ascontiguousarray(token_matrix.ids).tobytes())
+        digest.update(np.ascontiguousarray(token_matrix.offsets).tobytes())
+    else:
+        for tokens in texts:
+            digest.update("\x1f".join(tokens).encode('utf-8'))
+            digest.update(b"\x1e")
+    return digest.hexdigest()
+
+# ---------------------------------------------------
+# 🏗️ Construção do Dicionário Podado e do Corpus
+# ---------------------------------------------------
+def _prune(dictionary, no_below, no_above, keep_n):
+    """
+    Aplica filter_extremes, exceto em coleções pequenas ou quando a poda
+    removeria todas as palavras (o LDA não treina sem vocabulário).
+    """
+    if dictionary.num_docs < MIN_DOCS_TO_PRUNE:
+        return
+    max_docs = no_above * dictionary.num_docs
+    if not any(no_below <= df <= max_docs for df in dictionary.dfs.values()):
+        return
+    dictionary.filter_extremes(no_below=no_below, no_above=no_above, keep_n=keep_n)
+
+def _build(texts, token_matrix, no_below, no_above, keep_n):
+    if token_matrix is None:
+        dictionary = corpora.Dictionary(texts)
+        _prune(dictionary, no_below, no_above, keep_n)
+        return dictionary, (dictionary.doc2bow(text) for text in texts)
+
+    # Com a TokenMatrix, o corpus podado sai da matriz esparsa: as colunas
+    # mantidas são reordenadas para os novos ids do dicionário
+    dictionary, _ = token_matrix.to_gensim()
+    _prune(dictionary, no_below, no_above, keep_n)
+    position = {token: i for i, token in enumerate(token_matrix.vocab)}
+    columns = [position[dictionary[new_id]] for new_id in range(len(dictionary))]
+    matrix = token_matrix.to_csr()[:, columns]
+    return dictionary, matutils.Sparse2Corpus(matrix, documents_columns=False)
+
+# ---------------------------------------------------
+# 🧹 Limite de Tamanho do Cache (LRU)
+# ---------------------------------------------------
+def _evict(keep, max_bytes=MAX_BYTES):
+    """
+    Remove os conjuntos em cache usados há mais tempo (pela data de modificação,
+    renovada a cada leitura) até o diretório caber em max_bytes. O conjunto
+    `keep` (o que acabou de ser usado) nunca é removido.
+    """
+    entries, total = {}, 0
+    for entry in os.scandir(CORPUS_DIR):
+        key = re.sub(r"\.(dict|mm|mm\.index)$", "", entry.name)
+        stat = entry.stat()
+        total += stat.st_size
+        if key != keep:
+            size, accessed = entries.get(key, (0, stat.st_mtime))
+            entries[key] = (size + stat.st_size, max(accessed, stat.st_mtime))
+
+    for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if total <= max_bytes:
+            break
+        for suffix in CACHE_SUFFIXES:
+            try:
+                os.remove(os.path.join(CORPUS_DIR, key + suffix))
+            except OSError:
+                pass  # arquivo já removido (ex: por outra sessão)
+        total -= size
+
+def corpus_paths(texts, token_matrix=None, no_below=NO_BELOW, no_above=NO_ABOVE, keep_n=KEEP_N):
+    """
+    Garante que dicionário e corpus do conjunto estejam no cache em disco e
+    retorna seus caminhos (dict_path, corpus_path). A chave combina o hash do
+    conteúdo e os parâmetros da poda. O diretório é limitado a MAX_BYTES.
+    """
+    key = f"{dataset_hash(texts, token_matrix)}_{no_below}_{no_above}_{keep_n}"
+    dict_path = os.path.join(CORPUS_DIR, f"{key}.dict")
+    corpus_path = os.path.join(CORPUS_DIR, f"{key}.mm")
+
+    if not (os.path.exists(dict_path) and os.path.exists(corpus_path)):
+        os.makedirs(CORPUS_DIR, exist_ok=True)
+        dictionary, corpus = _build(texts, token_matrix, no_below, no_above, keep_n)
+        corpora.MmCorpus.serialize(corpus_path, corpus, id2word=dictionary)
+        dictionary.save(dict_path)
+        _evict(key)
+    else:
+        for path in (dict_path, corpus_path):
+            os.utime(path)  # marca o conjunto como usado recentemente
+    return dict_path, corpus_path
+
+def open_corpus(dict_path, corpus_path):
+    # O corpus é um MmCorpus (Matrix Market), lido do disco sob demanda
+    return corpora.Dictionary.load(dict_path), corpora.MmCorpus(corpus_path)
+
+def load_corpus(texts, token_matrix=None, no_below=NO_BELOW, no_above=NO_ABOVE, keep_n=KEEP_N):
+    """
+    Retorna (dicionário, corpus) do conjunto, lidos do cache em disco.
+    """
+    return open_corpus(*corpus_paths(texts, token_matrix, no_below, no_above, keep_n))
@@ -0,0 +1,56 @@
+# ---------------------------------------------------
+# 📦 Importações de Bibliotecas
+# ---------------------------------------------------
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------
+# ⚙️ Colunas e Tipos
+# ---------------------------------------------------
+COUNT_COLUMNS = ['comentarios', 'likes', 'compartilhamentos', 'repostagens', 'total']
+CATEGORY_COLUMNS = ['author_handle', 'author_displayName', 'idioma', 'tema']  # textos muito repetidos
+FEATURE_COLUMNS = ['hora', 'dia_semana', 'num_caracteres']
+
+# ---------------------------------------------------
+# 🧱 Conjunto de Posts Tipado, Montado na Ingestão
+# ---------------------------------------------------
+def build_feature_frame(df):
+    """
+    Converte os posts coletados em um DataFrame tipado, uma única vez:
+    - data_hora como datetime64 em UTC
+    - métricas de engajamento em int32
+    - autor, idioma e tema como category
+    - colunas derivadas: hora, dia_semana (0 = segunda) e num_caracteres
+    Datas ausentes ou inválidas viram NaT (e <NA> em hora e dia_semana).
+    As funções de análise leem estas colunas em vez de recalculá-las.
+    """
+    df = df.copy()
+
+    if 'data_hora' in df.columns and not isinstance(df['data_hora'].dtype, pd.DatetimeTZDtype):
+        df['data_hora'] = pd.to_datetime(df['data_hora'], utc=True, errors='coerce', format='ISO8601')
+    for column in COUNT_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype(np.int32)
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+
+    # 🕒 Variáveis de horário e tamanho usadas nas análises
+    if 'data_hora' in df.columns:
+        # Int8 anulável: posts sem data (ex: busca sem indexedAt) ficam com <NA>
+        df['hora'] = df['data_hora'].dt.hour.astype('Int8')
+        df['dia_semana'] = df['data_hora'].dt.dayofweek.astype('Int8')
+    if 'texto_original' in df.columns:
+        df['num_caracteres'] = df['texto_original'].fillna('').str.len().astype(np.int32)
+    return df
+
+def ensure_features(df):
+    """
+    Retorna o próprio DataFrame se ele já passou por build_feature_frame;
+    caso contrário (ex: um CSV antigo), monta o conjunto tipado.
+    """
+    ready = (
+        all(column in df.columns for column in FEATURE_COLUMNS + ['data_hora'])
+        and isinstance(df['data_hora'].dtype, pd.DatetimeTZDtype)
+    )
+    return df if ready else build_feature_frame(df)
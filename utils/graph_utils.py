@@ -9,20 +9,26 @@ import streamlit as st                 # Interface web interativa
 # ---------------------------------------------------
 # ☁️ Geração de WordCloud a partir de tokens
 # ---------------------------------------------------
-def generate_wordcloud(tokens_list):
+def generate_wordcloud(tokens_list, token_matrix=None):
     """
     Gera e exibe uma WordCloud com base em uma lista de listas de tokens.
+    Se o vocabulário codificado (TokenMatrix) for informado, usa as frequências
+    já calculadas em vez de juntar todos os tokens em um texto.
     """
-    # 🔤 Junta todos os tokens em uma única string
-    all_tokens = ' '.join([' '.join(tokens) for tokens in tokens_list])
-
     # ☁️ Cria a WordCloud com estilo personalizado
     wordcloud = WordCloud(
         width=800,
         height=400,
         background_color='white',
         colormap='viridis'
-    ).generate(all_tokens)
+    )
+
+    if token_matrix is not None:
+        wordcloud.generate_from_frequencies(token_matrix.frequencies())
+    else:
+        # 🔤 Junta todos os tokens em uma única string
+        all_tokens = ' '.join([' '.join(tokens) for tokens in tokens_list])
+        wordcloud.generate(all_tokens)
 
     # 🎨 Exibe a imagem no Streamlit
     fig, ax = plt.subplots(figsize=(10, 5))
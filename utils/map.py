@@ -5,8 +5,7 @@ import streamlit as st
 import pandas as pd
 import folium                                # Para visualização geográfica interativa
 from folium.plugins import MarkerCluster     # (Não usado neste trecho, mas útil para mapas com muitos pontos)
-from collections import defaultdict           # Para armazenar listas de sentimentos por estado
-from nltk.sentiment import SentimentIntensityAnalyzer  # Analisador VADER (pré-treinado)
+from utils.states import sentiment_by_state  # Sentimento médio por estado citado
 from streamlit_folium import folium_static   # Para renderizar mapas Folium no Streamlit
 
 # ---------------------------------------------------
@@ -39,28 +38,11 @@ def analyze_sentiment_by_state(df):
     """
     Analisa os textos dos posts e calcula a média do sentimento por estado mencionado.
     """
-    analyzer = SentimentIntensityAnalyzer()
-    sentiment_scores = defaultdict(list)
+    textos = df['texto_limpo'].dropna() if 'texto_limpo' in df.columns else pd.Series(dtype=object)
 
-    # 🔁 Percorre todos os textos da base
-    for _, row in df.iterrows():
-        text = row.get('texto_limpo', '')
-        if pd.notna(text):
-            sentiment = analyzer.polarity_scores(text)['compound']  # Valor entre -1 (negativo) e +1 (positivo)
-            
-            # Verifica se algum estado está mencionado no texto
-            for state in STATE_COORDINATES.keys():
-                if state.lower() in text.lower():
-                    sentiment_scores[state].append(sentiment)
-
-    # 📊 Calcula a média de sentimento para cada estado
-    avg_sentiments = {
-        state: sum(scores) / len(scores)
-        for state, scores in sentiment_scores.items()
-        if scores  # Apenas se houver sentimentos registrados
-    }
-
-    return avg_sentiments
+    # 🔎 Uma única regex com todos os estados (sem diferenciar maiúsculas) e
+    # média por estado em lote, avaliando só os textos que citam algum estado
+    return sentiment_by_state(textos, states=tuple(STATE_COORDINATES), case_sensitive=False)
 
 # ---------------------------------------------------
 # 🌍 Criação do Mapa de Sentimentos por Estado
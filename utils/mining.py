@@ -1,44 +1,37 @@
 # ---------------------------------------------------
 # 📦 Importações de Bibliotecas Necessárias
 # ---------------------------------------------------
+import ast
 import streamlit as st
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
-from nltk.sentiment import SentimentIntensityAnalyzer  # Analisador de sentimentos VADER (NLTK)
-from gensim import corpora                            # Para criação de dicionário textual
-from gensim.models import LdaModel                    # Modelo de tópicos LDA
-from gensim.models.coherencemodel import CoherenceModel  # Avaliação de coerência dos tópicos
-import nltk
+from concurrent.futures import ThreadPoolExecutor
 from wordcloud import WordCloud
-from collections import defaultdict
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-
-# ---------------------------------------------------
-# ⬇️ Download de Recursos do NLTK
-# ---------------------------------------------------
-nltk.download('vader_lexicon')  # Lexicon de sentimentos para o VADER
+from utils.sentiment import get_sentiment_service  # Serviço VADER com cache compartilhado
+from utils.states import US_STATES, sentiment_by_state  # Sentimento médio por estado citado
+from utils import topic_store                           # Modelo LDA persistido e atualizado incrementalmente
 
 # ---------------------------------------------------
 # 🚀 Configuração da Página Streamlit
 # ---------------------------------------------------
 st.title("Análise de Sentimentos e Modelagem de Tópicos")
 
+# Thread de fundo para a coerência dos tópicos (ver topicModeling com defer_coherence)
+_coherence_executor = ThreadPoolExecutor(max_workers=1)
+
 # ---------------------------------------------------
 # 💬 Função: Análise de Sentimentos com VADER
 # ---------------------------------------------------
-def analyzeSentiment(df):
-    sia = SentimentIntensityAnalyzer()
+def analyzeSentiment(df, workers=None, chunksize=2000):
     df['texto_limpo'] = df['texto_limpo'].fillna('')
 
-    # Aplica o analisador VADER a cada linha do DataFrame
-    sentiments = df['texto_limpo'].apply(
-        lambda text: sia.polarity_scores(text) if isinstance(text, str)
-        else {"neg": 0, "neu": 0, "pos": 0, "compound": 0}
-    )
+    # Avalia todos os textos em lote (textos já avaliados vêm do cache do serviço);
+    # com workers, os textos novos são divididos entre processos
+    sentiment_df = get_sentiment_service().score_frame(df['texto_limpo'], workers, chunksize)
 
     # Combina os scores ao DataFrame original
-    sentiment_df = pd.DataFrame(sentiments.tolist())
     df = pd.concat([df.reset_index(drop=True), sentiment_df.reset_index(drop=True)], axis=1)
     df = df.dropna(subset=['texto_limpo'])
 
@@ -68,43 +61,136 @@ def analyzeSentiment(df):
 # ---------------------------------------------------
 # 🧠 Função: Modelagem de Tópicos com LDA (Gensim)
 # ---------------------------------------------------
-def topicModeling(df, num_topics=5, passes=10):
+def topicModeling(df, num_topics=5, passes=10, token_matrix=None, model_name=None, retrain=False,
+                  workers=None, chunksize=topic_store.CHUNKSIZE, no_below=topic_store.NO_BELOW,
+                  no_above=topic_store.NO_ABOVE, coherence='c_v', coherence_sample=None, defer_coherence=False):
     """
     Aplica LDA para modelar os tópicos principais nos textos.
+    Com o vocabulário codificado (TokenMatrix), dicionário e corpus vêm direto dos ids.
+    Com model_name, o modelo fica salvo para o conjunto de dados e é apenas
+    atualizado com os posts novos nas próximas execuções (retrain=True treina do zero).
+    Com workers, o treino usa o LdaMulticore (-1 = todos os núcleos menos um).
+    O vocabulário é podado (palavras em menos de no_below posts ou em mais de
+    no_above dos posts) e dicionário/corpus ficam em cache pelo hash dos dados.
+
+    A coerência ('c_v', 'u_mass' ou None para não calcular) pode usar só uma
+    amostra de coherence_sample posts. Com defer_coherence, tópicos e WordClouds
+    aparecem na hora e a coerência é calculada em segundo plano; o valor é
+    exibido quando a página chama showPendingCoherence.
     """
-    # 🧹 Garante que os tokens estejam em formato de lista
+    # 🧹 Garante que os tokens estejam em formato de lista (CSVs antigos guardam o texto da lista)
     if isinstance(df['tokens'].iloc[0], str):
-        df['tokens'] = df['tokens'].apply(eval)
+        df['tokens'] = df['tokens'].apply(ast.literal_eval)
 
-    # Prepara textos, dicionário e corpus
     texts = df['tokens'].tolist()
-    dictionary = corpora.Dictionary(texts)
-    corpus = [dictionary.doc2bow(text) for text in texts]
+    if model_name:
+        # 💾 Modelo persistido: atualização incremental com os posts ainda não vistos
+        lda_model, info = topic_store.update_topic_model(
+            model_name, texts, topic_store.document_keys(df), num_topics, passes, retrain, token_matrix,
+            workers=workers, chunksize=chunksize, no_below=no_below, no_above=no_above
+        )
+        if info["modo"] == "treino":
+            st.caption(f"Modelo de tópicos treinado do zero com {info['novos']} posts.")
+        elif info["modo"] == "sem_novidades":
+            st.caption("Nenhum post novo desde a última análise: modelo de tópicos salvo reutilizado.")
+        else:
+            st.caption(f"Modelo de tópicos atualizado com {info['novos']} posts novos.")
+        if info["retreino_sugerido"]:
+            st.warning(f"{info['oov']:.0%} das palavras dos posts novos não estão no vocabulário do modelo. "
+                       "Considere retreinar o modelo de tópicos do zero.")
+    else:
+        # ⚙️ Treina o modelo LDA
+        lda_model, _, _ = topic_store.train_topic_model(texts, num_topics, passes, token_matrix, workers, chunksize,
+                                                        no_below, no_above)
+
+    _display_topics(lda_model)
+
+    # 📐 Avalia a coerência dos tópicos (na hora ou em segundo plano)
+    if coherence:
+        placeholder = st.empty()
+        if defer_coherence:
+            placeholder.caption(f"Calculando a coerência do modelo ({coherence})...")
+            future = _coherence_executor.submit(topic_store.compute_coherence, lda_model, texts, coherence, coherence_sample)
+            amostra = topic_store.coherence_sample_size(len(texts), coherence_sample)
+            st.session_state.setdefault("coerencias_pendentes", []).append((future, placeholder, coherence, amostra))
+        else:
+            coherence_score = topic_store.compute_coherence(lda_model, texts, coherence, coherence_sample)
+            amostra = topic_store.coherence_sample_size(len(texts), coherence_sample)
+            _show_coherence(placeholder, coherence, coherence_score, amostra)
 
-    # ⚙️ Treina o modelo LDA
-    lda_model = LdaModel(corpus, num_topics=num_topics, id2word=dictionary, passes=passes, random_state=42)
+    return lda_model
 
+def clearPendingCoherence():
+    """
+    Descarta coerências pendentes de execuções anteriores da página (os lugares
+    reservados para elas não existem mais após um rerun).
+    """
+    st.session_state["coerencias_pendentes"] = []
+
+def showPendingCoherence():
+    """
+    Exibe, nos lugares reservados, as coerências calculadas em segundo plano.
+    """
+    pendentes = st.session_state.get("coerencias_pendentes", [])
+    while pendentes:
+        future, placeholder, measure, amostra = pendentes.pop(0)
+        _show_coherence(placeholder, measure, future.result(), amostra)
+
+def _show_coherence(placeholder, measure, score, amostra):
+    # 📐 Valor da coerência, indicando quando veio de uma amostra dos posts
+    if np.isnan(score):
+        placeholder.warning(f"Não foi possível calcular a coerência do modelo ({measure}) com estes posts.")
+    elif amostra:
+        placeholder.write(f"**Coerência do modelo ({measure}, amostra de {amostra} posts):** {score:.4f}  \n"
+                          "_Valores de amostras não são comparáveis aos calculados com todos os posts._")
+    else:
+        placeholder.write(f"**Coerência do modelo ({measure}):** {score:.4f}")
+
+def _display_topics(lda_model):
     # 📋 Exibe os tópicos gerados
-    topics = lda_model.print_topics(num_words=10)
+    topics = lda_model.print_topics(num_topics=lda_model.num_topics, num_words=10)
     for topic in topics:
         st.write(f"**Tópico {topic[0]}:** {topic[1]}")
 
-    # 📐 Avalia a coerência dos tópicos
-    coherence_model = CoherenceModel(model=lda_model, texts=texts, dictionary=dictionary, coherence='c_v')
-    coherence_score = coherence_model.get_coherence()
-    st.write(f"**Coerência do modelo:** {coherence_score:.4f}")
-
     # ☁️ Gera WordCloud para cada tópico
-    fig, axes = plt.subplots(1, num_topics, figsize=(20, 5))
-    for i, topic in enumerate(topics):
+    fig, axes = plt.subplots(1, lda_model.num_topics, figsize=(20, 5), squeeze=False)
+    for i in range(lda_model.num_topics):
         words = dict(lda_model.show_topic(i, 30))
         wordcloud = WordCloud(width=300, height=300, background_color='white').generate_from_frequencies(words)
-        axes[i].imshow(wordcloud, interpolation="bilinear")
-        axes[i].axis("off")
-        axes[i].set_title(f"Tópico {i}")
+        axes[0, i].imshow(wordcloud, interpolation="bilinear")
+        axes[0, i].axis("off")
+        axes[0, i].set_title(f"Tópico {i}")
     st.pyplot(fig)
 
-    return lda_model
+# ---------------------------------------------------
+# 🔬 Função: Escolha do Número de Tópicos pela Coerência
+# ---------------------------------------------------
+def topicSweep(df, topic_counts=range(2, 11), passes=10, token_matrix=None, workers=None,
+               no_below=topic_store.NO_BELOW, no_above=topic_store.NO_ABOVE, coherence='c_v', coherence_sample=None):
+    """
+    Treina um LDA para cada número de tópicos em paralelo, exibe o ranking de
+    coerência e os tópicos do melhor modelo. Retorna (ranking, melhor_modelo).
+    """
+    if isinstance(df['tokens'].iloc[0], str):
+        df['tokens'] = df['tokens'].apply(ast.literal_eval)
+
+    ranking, lda_model = topic_store.sweep_topic_counts(
+        df['tokens'].tolist(), topic_counts, passes, token_matrix, workers, no_below=no_below, no_above=no_above,
+        measure=coherence or 'c_v', sample=coherence_sample
+    )
+
+    # 📊 Ranking das contagens testadas
+    st.write("**Coerência por número de tópicos:**")
+    amostra = topic_store.coherence_sample_size(len(df), coherence_sample)
+    if amostra:
+        st.caption(f"Coerência calculada com uma amostra de {amostra} posts: serve para comparar as contagens "
+                   "entre si, mas não é comparável a valores calculados com todos os posts.")
+    st.dataframe(ranking)
+    st.line_chart(ranking.set_index("num_topicos").sort_index()["coerencia"])
+
+    st.write(f"**Melhor número de tópicos:** {lda_model.num_topics}")
+    _display_topics(lda_model)
+    return ranking, lda_model
 
 # ---------------------------------------------------
 # 🗺️ Função: Análise de Sentimentos por Estado
@@ -113,35 +199,11 @@ def analyze_sentiment_by_state(df):
     """
     Analisa sentimentos de textos mencionando estados dos EUA e retorna os extremos (positivo e negativo).
     """
-    analyzer = SentimentIntensityAnalyzer()
-
-    # Lista completa de estados dos EUA
-    estados_eua = [
-        "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
-        "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky",
-        "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi",
-        "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico",
-        "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania",
-        "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont",
-        "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"
-    ]
-
-    sentiment_dict = defaultdict(list)
     coluna_texto = "texto_original" if "texto_original" in df.columns else "texto_limpo"
 
-    # 🔁 Percorre os textos e associa sentimentos aos estados mencionados
-    for text in df[coluna_texto].dropna():
-        states_mentioned = [state for state in estados_eua if state in text]
-        if states_mentioned:
-            sentiment_score = analyzer.polarity_scores(text)["compound"]
-            for state in states_mentioned:
-                sentiment_dict[state].append(sentiment_score)
-
-    # 🧮 Calcula a média de sentimento por estado
-    state_sentiments = {
-        state: sum(scores) / len(scores) if scores else 0
-        for state, scores in sentiment_dict.items()
-    }
+    # 🔎 Estados citados em cada texto (uma única regex, com limites de palavra)
+    # e média de sentimento por estado em lote
+    state_sentiments = sentiment_by_state(df[coluna_texto].dropna(), states=tuple(US_STATES))
 
     # 🔍 Identifica os estados com maior e menor sentimento
     if state_sentiments:
@@ -1,42 +1,75 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 
 # Imports de funções customizadas
 import utils.mining as mining
+from utils.features import ensure_features
 
 # ----------------------------
 # Funções de Pré-processamento e Visualização
 # ----------------------------
 
-def get_top_tokens(df, top_n=10):
+def get_top_tokens(df, top_n=10, token_matrix=None, min_support=1):
 
     """
-    Retorna um DataFrame com os tokens que acumularam maior engajamento.
+    Retorna um DataFrame com os tokens que acumularam maior engajamento:
+      - Engajamento: soma do 'total' dos posts (por ocorrência do token).
+      - Posts: número de posts distintos com o token.
+      - Engajamento Médio: média do 'total' desses posts.
+    Tokens presentes em menos de `min_support` posts são descartados.
+    Com o vocabulário codificado (TokenMatrix), as contas são feitas sobre os ids;
+    sem ele, os tokens são expandidos (explode) e agrupados de uma vez.
     """
-    token_engagement = {}
-    for _, row in df.iterrows():
-        for token in row['tokens']:
-            token_engagement[token] = token_engagement.get(token, 0) + row['total']
-    return pd.DataFrame(list(token_engagement.items()), columns=['Token', 'Engajamento']) \
-             .sort_values(by='Engajamento', ascending=False).head(top_n)
+    if token_matrix is not None:
+        total = df['total'].to_numpy(dtype=np.float64)
+        engajamento = token_matrix.weighted_sum(total)
+
+        # Pares (post, token) distintos vêm da matriz esparsa já sem duplicatas
+        matriz = token_matrix.to_csr()
+        posts = np.bincount(matriz.indices, minlength=len(token_matrix.vocab))
+        soma_posts = np.bincount(matriz.indices, weights=np.repeat(total, np.diff(matriz.indptr)),
+                                 minlength=len(token_matrix.vocab))
+        ranking = pd.DataFrame({
+            'Token': token_matrix.vocab,
+            'Engajamento': engajamento.astype(np.int64),
+            'Posts': posts,
+            'Engajamento Médio': np.divide(soma_posts, posts, out=np.zeros_like(soma_posts), where=posts > 0),
+        })
+    else:
+        tokens = df[['tokens', 'total']].reset_index(drop=True).explode('tokens').dropna(subset=['tokens'])
+        tokens = tokens.rename_axis('post').reset_index()
+        engajamento = tokens.groupby('tokens', sort=False)['total'].sum()
+        por_post = tokens.drop_duplicates(['post', 'tokens']).groupby('tokens', sort=False)['total'].agg(['count', 'mean'])
+        ranking = pd.DataFrame({
+            'Token': engajamento.index,
+            'Engajamento': engajamento.to_numpy(),
+            'Posts': por_post['count'].reindex(engajamento.index).to_numpy(),
+            'Engajamento Médio': por_post['mean'].reindex(engajamento.index).to_numpy(),
+        })
+
+    ranking = ranking[ranking['Posts'] >= min_support]
+    return ranking.sort_values(by='Engajamento', ascending=False, kind='stable').head(top_n).reset_index(drop=True)
 
 
 # ----------------------------
 # Análise de Características dos Posts
 # ----------------------------
 
-def analyze_post_features(df):
+def analyze_post_features(df, token_matrix=None):
 
     """
     Analisa características dos posts que possam estar associadas a engajamento alto ou baixo.
     """
     
     st.write("## Análise de Características dos Posts Relacionadas ao Engajamento")
-    
+
+    # num_caracteres e hora já vêm do conjunto tipado (build_feature_frame)
+    df = ensure_features(df)
+
     # 1. Quantidade de caracteres
-    df['num_caracteres'] = df['texto_original'].apply(len)
     st.write("### Relação entre Quantidade de Caracteres e Engajamento")
     fig, ax = plt.subplots()
     sns.scatterplot(x='num_caracteres', y='total', data=df, ax=ax)
@@ -48,7 +81,6 @@ def analyze_post_features(df):
     # st.write(f"Correlação entre número de caracteres e engajamento: {corr_chars:.2f}")
     
     # 2. Horário de Postagem
-    df['hora'] = pd.to_datetime(df['data_hora']).dt.hour
     st.write("### Engajamento Médio por Hora de Postagem")
     eng_por_hora = df.groupby('hora')['total'].mean().reset_index()
     fig2, ax2 = plt.subplots()
@@ -60,7 +92,7 @@ def analyze_post_features(df):
     
     # 3. Tokens com Maior Engajamento
     st.write("### Tokens com Maior Acúmulo de Engajamento")
-    top_tokens = get_top_tokens(df)
+    top_tokens = get_top_tokens(df, token_matrix=token_matrix)
     st.dataframe(top_tokens)
 
 # ----------------------------
@@ -0,0 +1,140 @@
+# ---------------------------------------------------
+# 📦 Importações de Bibliotecas
+# ---------------------------------------------------
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer  # Analisador VADER
+
+# ---------------------------------------------------
+# ⚙️ Configurações
+# ---------------------------------------------------
+SCORE_COLUMNS = ['neg', 'neu', 'pos', 'compound']
+CACHE_SIZE = 200_000  # número máximo de textos guardados no cache
+
+PARALLEL_CHUNKSIZE = 2000  # textos por tarefa enviada ao pool de processos
+
+def _text_key(text):
+    # Hash compacto do texto usado como chave do cache
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+# ---------------------------------------------------
+# ⚡ Funções Executadas nos Processos do Pool
+# ---------------------------------------------------
+_worker_analyzer = None
+
+def _init_worker():
+    # Cada processo carrega o léxico do VADER uma única vez
+    global _worker_analyzer
+    _worker_analyzer = SentimentIntensityAnalyzer()
+
+def _score_chunk(texts):
+    scores = map(_worker_analyzer.polarity_scores, texts)
+    return [tuple(s[column] for column in SCORE_COLUMNS) for s in scores]
+
+# ---------------------------------------------------
+# 💬 Serviço de Sentimentos com Cache
+# ---------------------------------------------------
+class SentimentService:
+    """
+    Calcula os scores VADER (neg, neu, pos, compound) de um lote de textos.
+    Cada texto distinto é avaliado uma única vez: os resultados ficam em um
+    cache LRU limitado, compartilhado por todas as análises da aplicação.
+    """
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self._analyzer = None
+
+    @property
+    def analyzer(self):
+        # O léxico só é carregado na primeira vez que for necessário
+        if self._analyzer is None:
+            self._analyzer = SentimentIntensityAnalyzer()
+        return self._analyzer
+
+    def _polarity(self, text):
+        scores = self.analyzer.polarity_scores(text)
+        return tuple(scores[column] for column in SCORE_COLUMNS)
+
+    def _compute(self, texts, workers, chunksize):
+        # Avalia os textos no próprio processo ou, com workers, em um pool de processos
+        if not workers or len(texts) <= chunksize:
+            return [self._polarity(text) for text in texts]
+
+        chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            return [scores for chunk in executor.map(_score_chunk, chunks) for scores in chunk]
+
+    def score(self, texts, workers=None, chunksize=PARALLEL_CHUNKSIZE):
+        """
+        Retorna um array (n, 4) com neg, neu, pos e compound de cada texto.
+        Valores que não são texto recebem zeros.
+        Com workers (-1 = todos os núcleos), os textos ainda não avaliados são
+        divididos em blocos de `chunksize` e processados em paralelo; o
+        resultado mantém a ordem de entrada.
+        """
+        if workers == -1:
+            workers = os.cpu_count()
+
+        texts = list(texts)
+        result = np.zeros((len(texts), len(SCORE_COLUMNS)), dtype=np.float64)
+
+        # 🔍 Agrupa posições por texto e separa o que ainda não está no cache
+        positions = {}
+        for i, text in enumerate(texts):
+            if isinstance(text, str):
+                positions.setdefault(text, []).append(i)
+
+        missing = []
+        with self.lock:
+            for text, rows in positions.items():
+                key = _text_key(text)
+                scores = self.cache.get(key)
+                if scores is None:
+                    missing.append((text, key))
+                else:
+                    self.cache.move_to_end(key)
+                    result[rows] = scores
+
+        # 🧮 Avalia apenas os textos novos
+        computed = self._compute([text for text, _ in missing], workers, chunksize)
+
+        with self.lock:
+            for (text, key), scores in zip(missing, computed):
+                result[positions[text]] = scores
+                self.cache[key] = scores
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        return result
+
+    def score_frame(self, texts, workers=None, chunksize=PARALLEL_CHUNKSIZE):
+        """
+        Mesmo que score, mas como DataFrame com as colunas neg, neu, pos e compound
+        (com o mesmo índice, se a entrada for uma Series).
+        """
+        index = texts.index if isinstance(texts, pd.Series) else None
+        return pd.DataFrame(self.score(texts, workers, chunksize), columns=SCORE_COLUMNS, index=index)
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+
+# ---------------------------------------------------
+# 🔁 Instância Compartilhada
+# ---------------------------------------------------
+_service = SentimentService()
+
+def get_sentiment_service():
+    return _service
+
+def score_texts(texts, workers=None, chunksize=PARALLEL_CHUNKSIZE):
+    return _service.score(texts, workers, chunksize)
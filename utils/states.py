@@ -0,0 +1,77 @@
+# ---------------------------------------------------
+# 📦 Importações de Bibliotecas
+# ---------------------------------------------------
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils.sentiment import get_sentiment_service  # Serviço VADER com cache compartilhado
+
+# ---------------------------------------------------
+# 🇺🇸 Estados dos EUA
+# ---------------------------------------------------
+US_STATES = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+    "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky",
+    "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi",
+    "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico",
+    "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania",
+    "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont",
+    "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"
+]
+
+# ---------------------------------------------------
+# 🔎 Busca de Menções em Uma Única Passada
+# ---------------------------------------------------
+@lru_cache(maxsize=None)
+def state_pattern(states=tuple(US_STATES), case_sensitive=True):
+    """
+    Compila uma única regex com todos os estados, nomes mais longos primeiro
+    (assim "West Virginia" tem prioridade sobre "Virginia"), com limites de palavra.
+    """
+    alternatives = "|".join(re.escape(state) for state in sorted(states, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})\b", 0 if case_sensitive else re.IGNORECASE)
+
+def find_state_mentions(texts, states=US_STATES, case_sensitive=True):
+    """
+    Encontra os estados citados em cada texto, percorrendo cada texto uma vez.
+    Retorna um DataFrame com uma linha por (posicao, estado): 'posicao' é a
+    posição do texto na entrada e cada estado aparece no máximo uma vez por texto.
+    """
+    texts = pd.Series(list(texts), dtype=object)
+    pattern = state_pattern(tuple(states), case_sensitive)
+
+    mentions = texts.where(texts.map(lambda text: isinstance(text, str)), "").str.findall(pattern).explode().dropna()
+    if not case_sensitive:
+        # Converte o trecho encontrado (ex: "new york") para o nome oficial do estado
+        canonical = {state.lower(): state for state in states}
+        mentions = mentions.str.lower().map(canonical)
+
+    return (
+        pd.DataFrame({"posicao": mentions.index.to_numpy(dtype=np.int64), "estado": mentions.to_numpy(dtype=object)})
+        .drop_duplicates()
+        .reset_index(drop=True)
+    )
+
+def sentiment_by_state(texts, states=US_STATES, case_sensitive=True):
+    """
+    Média do sentimento (compound do VADER) dos textos que citam cada estado.
+    Apenas os textos com alguma menção são avaliados, em um único lote.
+    """
+    texts = list(texts)
+    mentions = find_state_mentions(texts, states, case_sensitive)
+    if mentions.empty:
+        return {}
+
+    com_estado = mentions["posicao"].unique()
+    compound = np.zeros(len(texts), dtype=np.float64)
+    compound[com_estado] = get_sentiment_service().score([texts[i] for i in com_estado])[:, 3]
+
+    # 📊 Média por estado com um único groupby
+    return (
+        mentions.assign(compound=compound[mentions["posicao"].to_numpy()])
+        .groupby("estado", sort=False)["compound"].mean()
+        .to_dict()
+    )
@@ -0,0 +1,220 @@
+# ---------------------------------------------------
+# 📦 Importações de Bibliotecas
+# ---------------------------------------------------
+import os
+import re
+import json
+import time
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from gensim.models import LdaModel, LdaMulticore
+from gensim.models.coherencemodel import CoherenceModel
+
+from utils.corpus_store import load_corpus, corpus_paths, open_corpus, NO_BELOW, NO_ABOVE  # Dicionário podado e corpus em cache
+
+# ---------------------------------------------------
+# ⚙️ Configurações
+# ---------------------------------------------------
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output", "topicos")
+MAX_OOV = 0.2  # fração de tokens fora do vocabulário a partir da qual o retreino é sugerido
+CHUNKSIZE = 2000  # documentos por lote de treino do LDA (padrão do gensim)
+COHERENCE_MEASURES = ('c_v', 'u_mass')  # u_mass usa só o corpus bag-of-words e é bem mais rápida
+MIN_COHERENCE_SAMPLE = 1000  # amostras menores deixam o c_v instável (e NaN em tópicos sem coocorrências)
+
+def model_path(name):
+    # Um diretório por conjunto de dados (ex: o @ do usuário)
+    return os.path.join(MODEL_DIR, re.sub(r'[^\w.-]', '_', name))
+
+def document_keys(df):
+    # Identifica cada post pela URI; CSVs antigos sem URI usam os próprios tokens
+    if 'uri' in df.columns:
+        return df['uri'].astype(str).tolist()
+    return [" ".join(tokens) for tokens in df['tokens']]
+
+# ---------------------------------------------------
+# 💾 Leitura e Gravação do Modelo
+# ---------------------------------------------------
+def load_topic_model(name):
+    """
+    Retorna (modelo, metadados) salvos para o conjunto, ou (None, None).
+    """
+    path = model_path(name)
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return None, None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    return LdaModel.load(os.path.join(path, "lda.model")), meta
+
+def save_topic_model(name, lda_model, meta):
+    path = model_path(name)
+    os.makedirs(path, exist_ok=True)
+    lda_model.save(os.path.join(path, "lda.model"))  # Salva junto o dicionário (id2word)
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+# ---------------------------------------------------
+# 🧠 Treino Completo e Atualização Incremental
+# ---------------------------------------------------
+def train_topic_model(texts, num_topics=5, passes=10, token_matrix=None, workers=None, chunksize=CHUNKSIZE,
+                      no_below=NO_BELOW, no_above=NO_ABOVE):
+    """
+    Treina o LDA do zero e retorna (modelo, dicionário, corpus).
+    Dicionário (podado por no_below/no_above) e corpus vêm do cache em disco.
+    Com workers, usa o LdaMulticore (-1 = todos os núcleos menos um, padrão do gensim).
+    """
+    dictionary, corpus = load_corpus(texts, token_matrix, no_below, no_above)
+
+    if workers:
+        workers = max(1, (os.cpu_count() or 2) - 1) if workers == -1 else workers
+        lda_model = LdaMulticore(corpus, num_topics=num_topics, id2word=dictionary, passes=passes,
+                                 workers=workers, chunksize=chunksize, random_state=42)
+    else:
+        lda_model = LdaModel(corpus, num_topics=num_topics, id2word=dictionary, passes=passes,
+                             chunksize=chunksize, random_state=42)
+    return lda_model, dictionary, corpus
+
+def update_topic_model(name, texts, keys, num_topics=5, passes=10, retrain=False, token_matrix=None,
+                       max_oov=MAX_OOV, workers=None, chunksize=CHUNKSIZE, no_below=NO_BELOW, no_above=NO_ABOVE):
+    """
+    Mantém um LDA salvo por conjunto de dados. Posts ainda não vistos (pelas
+    chaves em `keys`) entram com LdaModel.update; o modelo só é treinado do
+    zero quando não existe, quando num_topics muda ou quando retrain=True.
+
+    O vocabulário do LDA é fixo: palavras novas são ignoradas na atualização.
+    A fração desses tokens desde o último treino completo é acompanhada e,
+    quando passa da fração já descartada pela poda no treino em mais de
+    `max_oov`, info['retreino_sugerido'] fica verdadeiro.
+
+    Retorna (modelo, info) com o modo usado, posts novos e fração fora do vocabulário.
+    """
+    lda_model, meta = (None, None) if retrain else load_topic_model(name)
+
+    if lda_model is None or meta.get("num_topics") != num_topics:
+        lda_model, dictionary, _ = train_topic_model(texts, num_topics, passes, token_matrix, workers, chunksize,
+                                                     no_below, no_above)
+        total_tokens = sum(len(text) for text in texts)
+        pruned_tokens = sum(1 for text in texts for token in text if token not in dictionary.token2id)
+        meta = {
+            "num_topics": num_topics,
+            "passes": passes,
+            "documentos": list(dict.fromkeys(keys)),
+            "tokens_novos": 0,
+            "tokens_fora_vocabulario": 0,
+            "oov_poda": pruned_tokens / total_tokens if total_tokens else 0.0,
+        }
+        save_topic_model(name, lda_model, meta)
+        return lda_model, {"modo": "treino", "novos": len(texts), "oov": 0.0, "retreino_sugerido": False}
+
+    # 🔍 Seleciona apenas os posts que o modelo ainda não viu
+    seen = set(meta["documentos"])
+    new_positions = [i for i, key in enumerate(keys) if key not in seen]
+    dictionary = lda_model.id2word
+
+    new_texts = [texts[i] for i in new_positions]
+    total_tokens = sum(len(text) for text in new_texts)
+    oov_tokens = sum(1 for text in new_texts for token in text if token not in dictionary.token2id)
+
+    if new_positions:
+        corpus = [dictionary.doc2bow(text) for text in new_texts]
+        if isinstance(lda_model, LdaMulticore):
+            # O update do LdaMulticore usa os passes e o chunksize guardados no modelo
+            lda_model.passes, lda_model.chunksize = passes, chunksize
+            lda_model.update(corpus)
+        else:
+            lda_model.update(corpus, passes=passes, chunksize=chunksize)
+
+        meta["documentos"].extend(dict.fromkeys(keys[i] for i in new_positions))
+        meta["tokens_novos"] += total_tokens
+        meta["tokens_fora_vocabulario"] += oov_tokens
+        save_topic_model(name, lda_model, meta)
+
+    oov = meta["tokens_fora_vocabulario"] / meta["tokens_novos"] if meta["tokens_novos"] else 0.0
+    return lda_model, {
+        "modo": "atualizacao" if new_positions else "sem_novidades",
+        "novos": len(new_positions),
+        "oov": oov,
+        "retreino_sugerido": oov - meta.get("oov_poda", 0.0) > max_oov,
+    }
+
+# ---------------------------------------------------
+# 📐 Coerência dos Tópicos
+# ---------------------------------------------------
+def coherence_sample_size(num_texts, sample):
+    """
+    Número de posts efetivamente sorteados para a coerência, ou None quando
+    todos são usados (sem sample ou com o conjunto menor que a amostra).
+    """
+    if not sample:
+        return None
+    sample = max(sample, MIN_COHERENCE_SAMPLE)
+    return sample if num_texts > sample else None
+
+def compute_coherence(lda_model, texts, measure='c_v', sample=None):
+    """
+    Coerência do modelo pela medida escolhida ('c_v' ou 'u_mass'). Com sample,
+    usa no máximo esse número de posts sorteados (sempre os mesmos para o mesmo
+    conjunto), nunca menos que MIN_COHERENCE_SAMPLE. A média ignora tópicos cuja
+    coerência não pôde ser calculada na amostra (NaN). Valores de amostras não
+    são comparáveis aos calculados com todos os posts.
+    """
+    if measure not in COHERENCE_MEASURES:
+        raise ValueError(f"Medida de coerência desconhecida: '{measure}'. Opções: {', '.join(COHERENCE_MEASURES)}")
+
+    texts = list(texts)
+    sample = coherence_sample_size(len(texts), sample)
+    if sample:
+        texts = [texts[i] for i in sorted(random.Random(42).sample(range(len(texts)), sample))]
+
+    dictionary = lda_model.id2word
+    if measure == 'u_mass':
+        corpus = [dictionary.doc2bow(text) for text in texts]
+        model = CoherenceModel(model=lda_model, corpus=corpus, dictionary=dictionary, coherence='u_mass')
+    else:
+        model = CoherenceModel(model=lda_model, texts=texts, dictionary=dictionary, coherence='c_v')
+    per_topic = np.asarray(model.get_coherence_per_topic(), dtype=np.float64)
+    return float(np.nanmean(per_topic)) if not np.isnan(per_topic).all() else float('nan')
+
+# ---------------------------------------------------
+# 🔬 Varredura do Número de Tópicos em Paralelo
+# ---------------------------------------------------
+def _train_and_score(dict_path, corpus_path, texts, num_topics, passes, chunksize, measure, sample):
+    # Executado em um processo do pool: lê o corpus compartilhado do cache,
+    # treina um LDA e mede sua coerência
+    inicio = time.perf_counter()
+    dictionary, corpus = open_corpus(dict_path, corpus_path)
+    lda_model = LdaModel(corpus, num_topics=num_topics, id2word=dictionary, passes=passes,
+                         chunksize=chunksize, random_state=42)
+    coherence = compute_coherence(lda_model, texts, measure, sample)
+    return num_topics, coherence, time.perf_counter() - inicio, lda_model
+
+def sweep_topic_counts(texts, topic_counts=range(2, 11), passes=10, token_matrix=None, workers=None,
+                       chunksize=CHUNKSIZE, no_below=NO_BELOW, no_above=NO_ABOVE, measure='c_v', sample=None):
+    """
+    Treina um LDA para cada número de tópicos em `topic_counts`, em paralelo
+    (um processo por contagem, até `workers`; None = todos os núcleos), todos
+    sobre o mesmo corpus em cache. Retorna (ranking, melhor_modelo): o ranking
+    é um DataFrame ordenado pela coerência (`measure`), da maior para a menor.
+    """
+    topic_counts = sorted(set(topic_counts))
+    dict_path, corpus_path = corpus_paths(texts, token_matrix, no_below, no_above)
+    texts = list(texts)
+
+    workers = min(len(topic_counts), workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_train_and_score, dict_path, corpus_path, texts, k, passes, chunksize, measure, sample)
+            for k in topic_counts
+        ]
+        results = [future.result() for future in futures]
+
+    ranking = (
+        pd.DataFrame([(k, coherence, seconds) for k, coherence, seconds, _ in results],
+                     columns=["num_topicos", "coerencia", "tempo_s"])
+        .sort_values("coerencia", ascending=False, ignore_index=True)
+    )
+    models = {k: model for k, _, _, model in results}
+    return ranking, models[int(ranking.loc[0, "num_topicos"])]
@@ -0,0 +1,87 @@
+# ---------------------------------------------------
+# 📦 Importações de Bibliotecas
+# ---------------------------------------------------
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# ---------------------------------------------------
+# 🔢 Vocabulário Compartilhado e Tokens Codificados (CSR)
+# ---------------------------------------------------
+class TokenMatrix:
+    """
+    Tokens de todos os posts codificados uma única vez como inteiros:
+    - vocab: lista com cada palavra distinta (o id é a posição na lista)
+    - ids: int32 com os ids de todos os tokens, post após post
+    - offsets: início de cada post em ids (o post i vai de offsets[i] a offsets[i+1])
+    WordCloud, ranking de tokens e corpus do LDA são montados a partir destes
+    arrays, sem recriar strings.
+    """
+
+    def __init__(self, vocab, ids, offsets):
+        self.vocab = vocab
+        self.ids = ids
+        self.offsets = offsets
+
+    @classmethod
+    def from_tokens(cls, tokens_list):
+        # Interna todas as palavras de uma vez com pd.factorize (hash em C)
+        tokens_list = list(tokens_list)
+        lengths = np.fromiter((len(tokens) for tokens in tokens_list), dtype=np.int64, count=len(tokens_list))
+        offsets = np.zeros(len(tokens_list) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        flat = np.fromiter(chain.from_iterable(tokens_list), dtype=object, count=int(offsets[-1]))
+        codes, uniques = pd.factorize(flat)
+        return cls(list(uniques), codes.astype(np.int32), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def doc_ids(self, i):
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def counts(self):
+        """
+        Frequência de cada id do vocabulário em todo o conjunto.
+        """
+        return np.bincount(self.ids, minlength=len(self.vocab))
+
+    def frequencies(self):
+        # Dicionário palavra -> frequência (formato do WordCloud.generate_from_frequencies)
+        counts = self.counts()
+        return {self.vocab[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def weighted_sum(self, weights):
+        """
+        Soma, para cada id, o peso do post em que ele aparece (ex: engajamento total).
+        Um token repetido no mesmo post conta uma vez por ocorrência.
+        """
+        per_token = np.repeat(np.asarray(weights, dtype=np.float64), self.lengths)
+        return np.bincount(self.ids, weights=per_token, minlength=len(self.vocab))
+
+    def to_csr(self):
+        """
+        Matriz esparsa posts x vocabulário com a contagem de cada token por post.
+        """
+        data = np.ones(len(self.ids), dtype=np.int32)
+        # Cópias: sum_duplicates ordena os índices no lugar e alteraria self.ids
+        matrix = sparse.csr_matrix((data, self.ids.copy(), self.offsets.copy()), shape=(len(self), len(self.vocab)))
+        matrix.sum_duplicates()
+        return matrix
+
+    def to_gensim(self):
+        """
+        Retorna (dicionário, corpus bag-of-words) do gensim sem passar pelas strings.
+        """
+        from gensim import corpora, matutils
+
+        corpus = list(matutils.Sparse2Corpus(self.to_csr(), documents_columns=False))
+        dictionary = corpora.Dictionary.from_corpus(corpus, id2word=dict(enumerate(self.vocab)))
+        return dictionary, corpus